@@ -20,14 +20,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from importlib import reload as _reload  # DEBUG
-
-from . import (
+from . import (  # noqa: F401
     logging,
     types,
     configure,
     file_metadata,
     timebases,
+    dataio,
     daq,
     trials,
     videos,
@@ -38,20 +37,6 @@ from . import (
     batch,
 )
 
-_reload(logging)  # DEBUG
-_reload(types)  # DEBUG
-_reload(configure)  # DEBUG
-_reload(file_metadata)  # DEBUG
-_reload(timebases)  # DEBUG
-_reload(daq)  # DEBUG
-_reload(trials)  # DEBUG
-_reload(videos)  # DEBUG
-_reload(imaging)  # DEBUG
-_reload(rois)  # DEBUG
-_reload(tracking)  # DEBUG
-_reload(packaging)  # DEBUG
-_reload(batch)  # DEBUG
-
 # classes
 PathSettings = configure.PathSettings
 
@@ -34,6 +34,7 @@ from .types import (
 )
 from . import (
     logging as _logging,
+    configure as _configure,
     packaging as _packaging,
 )
 
@@ -59,6 +60,7 @@ def find_missing(
     eye_model_dir: Optional[PathLike] = None,
 ):
     logger = _logging.get_logger(file_output=True, prefix='batch_')
+    _configure.clear_dlc_config_cache()
 
     missing = []
     for sess in _sessx.iterate_sessions(
@@ -99,11 +101,14 @@ def run_batch(
     todate: Optional[str] = None,
     type: Optional[str] = None,
     copy_videos: bool = True,
+    video_copy_mode: str = 'auto',
     register_rois: bool = True,
     write_imaging_frames: bool = True,
+    compress_imaging_frames: bool = True,
     add_downsampled: bool = True,
     override_metadata: Optional[str] = None,
     overwrite: bool = False,
+    compression: Optional[str] = 'gzip',
     verbose: bool = True,
     sessroot: Optional[PathLike] = None,
     rawroot: Optional[PathsLike] = None,
@@ -123,6 +128,8 @@ def run_batch(
     logger.info(f"log file: {_logging.get_file_path()}")
 
     override_metadata = parse_overridden_metadata(override_metadata)
+    if compression == 'none':
+        compression = None
     sessions_processed = []
     sessions_without_rawdata = []
     sessions_with_problem = []
@@ -148,8 +155,10 @@ def run_batch(
             _packaging.process(
                 session=sess,
                 copy_videos=copy_videos,
+                video_copy_mode=video_copy_mode,
                 register_rois=register_rois,
                 write_imaging_frames=write_imaging_frames,
+                compress_imaging_frames=compress_imaging_frames,
                 add_downsampled=add_downsampled,
                 rawroot=rawroot,
                 videoroot=videoroot,
@@ -164,6 +173,7 @@ def run_batch(
                 nwbroot=nwbroot,
                 override_metadata=override_metadata,
                 overwrite=overwrite,
+                compression=compression,
                 verbose=verbose,
             )
         except OSError:
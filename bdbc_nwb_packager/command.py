@@ -61,12 +61,25 @@ parser.add_argument(
     dest='copy_videos',
     help='suppresses copying of videos to the publication directory',
 )
+parser.add_argument(
+    '--video-copy-mode',
+    default='auto',
+    choices=('auto', 'copy', 'hardlink', 'symlink'),
+    dest='video_copy_mode',
+    help="how videos are placed in the publication directory (default: auto, i.e. hard links on the same file system, and copies otherwise)",
+)
 parser.add_argument(
     '--no-write-imaging',
     action='store_false',
     dest='write_imaging_frames',
     help='suppresses writing out imaging frames to the publication directory',
 )
+parser.add_argument(
+    '--no-compress-imaging',
+    action='store_false',
+    dest='compress_imaging_frames',
+    help='writes out the imaging frames as uncompressed TIFF files',
+)
 parser.add_argument(
     '--no-write-rois',
     action='store_false',
@@ -85,6 +98,12 @@ parser.add_argument(
     dest='override_metadata',
     help="comma-separated metadata entries, in a 'field=value' format, to override entries in the raw-data files",
 )
+parser.add_argument(
+    '--compression',
+    default='gzip',
+    choices=('gzip', 'zstd', 'none'),
+    help="the compression filter for the time series in the NWB file (default: gzip). 'zstd' requires hdf5plugin, also for reading the file",
+)
 parser.add_argument(
     '-f', '--force',
     action='store_true',
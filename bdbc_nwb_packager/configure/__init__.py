@@ -21,18 +21,12 @@
 # SOFTWARE.
 """configuration of file paths related to processing of a single session."""
 
-from importlib import reload as _reload  # DEBUG
-
 from . import (
     source,
     target,
     session,
 )
 
-_reload(source)  # DEBUG
-_reload(target)  # DEBUG
-_reload(session)  # DEBUG
-
 SourceVideoFile = source.SourceVideoFile
 SourceVideoFiles = source.SourceVideoFiles
 DLCResultFiles = source.DLCResultFiles
@@ -48,3 +42,4 @@ PathSettings = session.PathSettings
 setup_source_paths = source.setup_source_paths
 setup_destination_paths = target.setup_destination_paths
 setup_path_settings = session.setup_path_settings
+clear_dlc_config_cache = session.clear_dlc_config_cache
@@ -21,10 +21,11 @@
 # SOFTWARE.
 """the session-level configuration logic (that gathers the 'source' and the 'destination' parts)"""
 
-from typing import Optional, ClassVar, Iterator
+from typing import Optional, ClassVar
 from typing_extensions import Self
 from pathlib import Path
 from dataclasses import dataclass
+from functools import lru_cache as _lru_cache
 
 import bdbc_session_explorer as _sessx
 
@@ -42,8 +43,31 @@ from .target import (
 )
 
 
+@_lru_cache(maxsize=None)
+def locate_dlc_config_files(
+    bodymodeldir: Optional[PathLike] = None,
+    facemodeldir: Optional[PathLike] = None,
+    eyemodeldir: Optional[PathLike] = None,
+) -> tuple[tuple[str, Path]]:
+    """looks up the DeepLabCut config files.
+    the results are cached until `clear_dlc_config_cache` is called,
+    i.e. at the beginning of each session being packaged."""
+    configs = _sessx.dlc_config_files(
+        body=bodymodeldir,
+        face=facemodeldir,
+        eye=eyemodeldir,
+    )
+    return tuple(configs.items())
+
+
+def clear_dlc_config_cache():
+    """makes `locate_dlc_config_files` look up the config files again,
+    e.g. after the model directories or the environment have changed."""
+    locate_dlc_config_files.cache_clear()
+
+
 # TODO: what if the views changed? (maybe the use of dict's would be better?)
-@dataclass
+@dataclass(slots=True)
 class DLCModelConfigs:
     body: Path
     face: Path
@@ -57,19 +81,18 @@ class DLCModelConfigs:
         facemodeldir: Optional[PathLike] = None,
         eyemodeldir: Optional[PathLike] = None,
     ) -> Self:
-        configs = _sessx.dlc_config_files(
-            body=bodymodeldir,
-            face=facemodeldir,
-            eye=eyemodeldir,
+        configs = locate_dlc_config_files(
+            bodymodeldir=bodymodeldir,
+            facemodeldir=facemodeldir,
+            eyemodeldir=eyemodeldir,
         )
-        return cls(**configs)
+        return cls(**dict(configs))
 
-    def items(self) -> Iterator[tuple[str, Path]]:
-        for fld in self.FIELDS:
-            yield (fld, getattr(self, fld))
+    def items(self) -> tuple[tuple[str, Path]]:
+        return tuple((fld, getattr(self, fld)) for fld in self.FIELDS)
 
 
-@dataclass
+@dataclass(slots=True)
 class PathSettings:
     session: _sessx.Session
     source: SourcePaths
@@ -39,7 +39,7 @@ from .. import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class SourceVideoFile:
     path: Optional[Path]
     width: int
@@ -80,7 +80,7 @@ class SourceVideoFile:
 
 
 # TODO: what if the views changed? (maybe the use of dict's would be better?)
-@dataclass
+@dataclass(slots=True)
 class SourceVideoFiles:
     body: SourceVideoFile
     face: SourceVideoFile
@@ -128,7 +128,7 @@ class SourceVideoFiles:
 
 
 # TODO: what if the views changed? (maybe the use of dict's would be better?)
-@dataclass
+@dataclass(slots=True)
 class DLCResultFiles:
     body: Optional[Path]
     face: Optional[Path]
@@ -162,7 +162,7 @@ class DLCResultFiles:
         return any((getattr(self, view) is not None) for view in ('body', 'face', 'eye'))
 
 
-@dataclass
+@dataclass(slots=True)
 class SourcePaths:
     rawdata: Path
     videos: SourceVideoFiles
@@ -30,7 +30,7 @@ import bdbc_session_explorer as _sessx
 
 
 # TODO: what if the channel configs changed? (maybe the use of dict's would be better?)
-@dataclass
+@dataclass(slots=True)
 class ImagingDataFiles:
     B: Path
     V: Path
@@ -43,7 +43,7 @@ class ImagingDataFiles:
 
 
 # TODO: what if the views changed? (maybe the use of dict's would be better?)
-@dataclass
+@dataclass(slots=True)
 class DestinationVideoFiles:
     body: Path
     face: Path
@@ -57,7 +57,7 @@ class DestinationVideoFiles:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DestinationPaths:
     nwb: Path
     imaging: ImagingDataFiles
@@ -24,26 +24,34 @@ from typing import Iterator
 from time import time as _now
 
 import numpy as _np
-import h5py as _h5
 import pynwb as _nwb
 
-from .types import PathLike
+from .types import (
+    H5FileLike,
+    open_h5 as _open_h5,
+)
 from . import (
     logging as _logging,
     file_metadata as _file_metadata,
     timebases as _timebases,
 )
+from .dataio import (
+    Compression,
+    DEFAULT_COMPRESSION,
+    compressed as _compressed,
+)
 
 
 def iterate_raw_daq_recordings(
     metadata: _file_metadata.Metadata,
-    rawfile: PathLike,
+    rawfile: H5FileLike,
     timebases: _timebases.Timebases,
+    compression: Compression = DEFAULT_COMPRESSION,
     verbose: bool = True,
 ) -> Iterator[_nwb.TimeSeries]:
     _logging.info("start retrieving raw DAQ data")
     start = _now()
-    with _h5.File(rawfile, 'r') as src:
+    with _open_h5(rawfile) as src:
         raw = _np.array(src['behavior_raw/data']).T  # --> shape (T, N)
     assert raw.shape[1] == len(metadata.task.raw_labels)
 
@@ -53,10 +61,10 @@ def iterate_raw_daq_recordings(
         lab = lab.replace('_raw', '').strip()  # FIXME; need description
         if len(lab) == 0:
             continue
-        _logging.debug(f"found record: {lab}")
+        _logging.debug("found record: %s", lab)
         yield _nwb.TimeSeries(
             name=lab,
-            data=raw[:, i],
+            data=_compressed(raw[:, i], compression=compression),
             unit="a.u.",  # FIXME: check units
             timestamps=t,
         )
@@ -67,13 +75,14 @@ def iterate_raw_daq_recordings(
 
 def iterate_downsampled_daq_recordings(
     metadata: _file_metadata.Metadata,
-    rawfile: PathLike,
+    rawfile: H5FileLike,
     timebases: _timebases.Timebases,
+    compression: Compression = DEFAULT_COMPRESSION,
     verbose: bool = True,
 ) -> Iterator[_nwb.TimeSeries]:
     _logging.info("start retrieving down-sampled DAQ data")
     start = _now()
-    with _h5.File(rawfile, 'r') as src:
+    with _open_h5(rawfile) as src:
         ds = _np.array(src['behavior_ds/data']).T  # --> shape (T, N)
     assert ds.shape[1] == len(metadata.task.downsampled_labels)
     assert ds.shape[0] >= timebases.B.size
@@ -85,10 +94,10 @@ def iterate_downsampled_daq_recordings(
         lab = lab.replace('_ds', '').strip()  # FIXME; need description
         if len(lab) == 0:
             continue
-        _logging.debug(f"found record: {lab}")
+        _logging.debug("found record: %s", lab)
         yield _nwb.TimeSeries(
             name=lab,
-            data=ds[clip, i],
+            data=_compressed(ds[clip, i], compression=compression),
             unit="a.u.",  # FIXME: check units
             timestamps=t,
         )
@@ -0,0 +1,82 @@
+# MIT License
+#
+# Copyright (c) 2024-2025 Keisuke Sehara, Ryo Aoki, and Shoya Sugimoto
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""wrappers that configure how the datasets are written into NWB files."""
+
+from typing import Union, Literal, Optional
+
+import numpy as _np
+import numpy.typing as _npt
+from hdmf.backends.hdf5 import H5DataIO as _H5DataIO
+
+try:
+    import hdf5plugin as _hdf5plugin
+except ImportError:
+    _hdf5plugin = None
+
+Compression = Optional[Literal['gzip', 'zstd']]
+DEFAULT_COMPRESSION: Compression = 'gzip'  # readable without any plugins
+GZIP_LEVEL = 4
+ZSTD_LEVEL = 1
+CHUNK_BYTES = 1 << 20  # ~1 MiB per chunk
+
+
+def chunk_shape(data: _npt.NDArray) -> tuple[int]:
+    """the chunk shape that spans the whole of the axes other than
+    the first (time) axis, with approx. `CHUNK_BYTES` per chunk."""
+    rowbytes = max(1, data[:1].nbytes)
+    rows = max(1, min(data.shape[0], CHUNK_BYTES // rowbytes))
+    return (rows,) + tuple(data.shape[1:])
+
+
+def compressed(
+    data: _npt.NDArray,
+    compression: Compression = DEFAULT_COMPRESSION,
+) -> Union[_npt.NDArray, _H5DataIO]:
+    """wraps `data` so that it is written in time-aligned chunks,
+    using the specified compression filter.
+
+    - 'gzip' uses the filter built into HDF5.
+    - 'zstd' requires `hdf5plugin`, also for reading the resulting file.
+    - None writes the chunks uncompressed."""
+    data = _np.asarray(data)
+    if data.size == 0:
+        return data
+    if compression is None:
+        return _H5DataIO(data=data, chunks=chunk_shape(data))
+    elif compression == 'gzip':
+        return _H5DataIO(
+            data=data,
+            chunks=chunk_shape(data),
+            compression='gzip',
+            compression_opts=GZIP_LEVEL,
+        )
+    elif compression == 'zstd':
+        if _hdf5plugin is None:
+            raise ImportError("the 'zstd' compression requires `hdf5plugin` to be installed")
+        return _H5DataIO(
+            data=data,
+            chunks=chunk_shape(data),
+            allow_plugin_filters=True,
+            **_hdf5plugin.Zstd(clevel=ZSTD_LEVEL),
+        )
+    else:
+        raise ValueError(f"expected one of ('gzip', 'zstd', None), got {repr(compression)}")
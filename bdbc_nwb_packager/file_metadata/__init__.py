@@ -21,8 +21,6 @@
 # SOFTWARE.
 """(data-)classes and procedures related to the handling of NWB metadata"""
 
-from importlib import reload as _reload  # DEBUG
-
 from . import (
     common,
     devices,
@@ -32,13 +30,6 @@ from . import (
     highlevel,
 )
 
-_reload(common)  # DEBUG
-_reload(devices)  # DEBUG
-_reload(session)  # DEBUG
-_reload(recording)  # DEBUG
-_reload(rois)  # DEBUG
-_reload(highlevel)  # DEBUG
-
 # error types
 MetadataParseError = common.MetadataParseError
 
@@ -32,6 +32,7 @@ from .. import (
 
 
 PathLike = _types.PathLike
+H5FileLike = _types.H5FileLike
 JSONLike = dict[str, Any]
 
 
@@ -40,7 +41,7 @@ class MetadataParseError(ValueError):
         super().__init__(msg)
 
 
-def read_metadata_as_dict(h5file: PathLike) -> JSONLike:
+def read_metadata_as_dict(h5file: H5FileLike) -> JSONLike:
     def pythonify_(entry: _h5.Dataset) -> Any:
         content = _np.array(entry).ravel()
         if _np.issubdtype(content.dtype, _np.integer):
@@ -61,7 +62,7 @@ def read_metadata_as_dict(h5file: PathLike) -> JSONLike:
         content = _np.array(entry).ravel()
         return tuple(item.decode('utf-8') for item in content)
 
-    with _h5.File(h5file, 'r') as src:
+    with _types.open_h5(h5file) as src:
         group = src['metadata']
         metadata = dict((key.lower(), pythonify_(group[key])) for key in group.keys())
         metadata['bhv_raw_labels'] = as_string_items_(src['behavior_raw/label'])
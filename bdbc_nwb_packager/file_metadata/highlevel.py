@@ -33,6 +33,7 @@ from .. import logging as _logging
 from .common import (
     JSONLike,
     PathLike,
+    H5FileLike,
     read_metadata_as_dict as _read_metadata_as_dict,
 )
 from .devices import (
@@ -68,7 +69,7 @@ class Metadata:
 
 def read_recordings_metadata(
     session: _sessx.Session,
-    rawfile: PathLike,
+    rawfile: H5FileLike,
     override: Optional[JSONLike] = None,
 ) -> Metadata:
     basedict = _read_metadata_as_dict(rawfile)
@@ -86,6 +86,8 @@ class ImagingMetadata:
         )
         pix = dct['imaging_pixel_size']
         rate = dct['imaging_frame_rate']
+        exc = tuple(float(v) for v in dct['exc_wavelength'])
+        emi = tuple(float(v) for v in dct['emi_wavelength'])
         channel_names = (
             dct['exc_order1'].upper(),
             dct['exc_order2'].upper(),
@@ -93,8 +95,8 @@ class ImagingMetadata:
         chans = tuple(
             ImagingPlaneMetadata(
                 chan,
-                excitation=float(dct['exc_wavelength'][i]),
-                emission=float(dct['emi_wavelength'][i]),
+                excitation=exc[i],
+                emission=emi[i],
                 pixel_size=pix,
                 frame_rate=rate,
                 description=dct[f'imaging_plane_description{i + 1}'],
@@ -42,10 +42,8 @@ class ROISetMetadata:
     rois: tuple[SingleROIMetadata]
 
     def transform_as_table(self) -> _pd.DataFrame:
-        tab = _pd.DataFrame(data={
-            'x_in': self.transform[:, 0],
-            'y_in': self.transform[:, 1],
-            'c_in': self.transform[:, 2],
-        })
-        tab.index = ['x_out', 'y_out']
-        return tab
+        return _pd.DataFrame(
+            self.transform,
+            columns=('x_in', 'y_in', 'c_in'),
+            index=('x_out', 'y_out'),
+        )
@@ -24,15 +24,29 @@ from typing_extensions import Self
 from pathlib import Path
 from dataclasses import dataclass
 from time import time as _now
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+import os as _os
+import zlib as _zlib
 
 import numpy as _np
 import numpy.typing as _npt
 import h5py as _h5
 import pynwb as _nwb
-from tifffile import TiffWriter as _TiffWriter
+from tifffile import (
+    TiffWriter as _TiffWriter,
+    memmap as _tiff_memmap,
+)
 from tqdm import tqdm as _tqdm
 
-from .types import PathLike
+try:
+    import imagecodecs as _imagecodecs
+except ImportError:
+    _imagecodecs = None
+
+from .types import (
+    H5FileLike,
+    open_h5 as _open_h5,
+)
 from . import (
     logging as _logging,
     configure as _configure,
@@ -40,18 +54,33 @@ from . import (
     timebases as _timebases,
 )
 
+WRITE_BATCH_SIZE = 512  # the number of frames copied to TIFF at once
+READ_BLOCK_BYTES = 64 * 1024 ** 2  # the approximate size of a block of frames read from HDF5
+DECOMPRESS_WORKERS = _os.cpu_count() or 1  # the number of threads to decompress HDF5 chunks
+TIFF_COMPRESSION_LEVEL = 3
+
+
+def tiff_compression() -> dict[str, object]:
+    """the compression options for TIFF writing.
+    Zstd is used in case `imagecodecs` is installed, and Deflate otherwise."""
+    if _imagecodecs is None:
+        return dict(compression='zlib', compressionargs=dict(level=TIFF_COMPRESSION_LEVEL))
+    return dict(compression='zstd', compressionargs=dict(level=TIFF_COMPRESSION_LEVEL))
+
 
 @dataclass
 class ImagingData:
     time: _npt.NDArray[_np.floating]
-    B: Optional[_npt.NDArray[_np.floating]]
-    V: Optional[_npt.NDArray[_np.floating]]
+    B: Optional[_npt.NDArray[_np.number]]  # in the dtype of the raw data
+    V: Optional[_npt.NDArray[_np.number]]
     CHANNELS: ClassVar[tuple[str]] = ('B', 'V')
 
     def has_data(self) -> bool:
         return all((getattr(self, ch) is not None) for ch in self.CHANNELS)
 
     def flatten(self, verbose: bool = True) -> Self:
+        """returns (T, H * W) views of the frames.
+        a copy is made only in case the frames are not C-contiguous."""
         if self.B.ndim == 2:
             return self
         data = dict(time=self.time)
@@ -59,6 +88,7 @@ class ImagingData:
         for fld in self.CHANNELS:
             _logging.info(f"flattening {fld} frames...")
             frames = getattr(self, fld)
+            frames = _np.ascontiguousarray(frames)
             data[fld] = frames.reshape((frames.shape[0], -1))
         stop = _now()
         _logging.info(f"done flattening frames (took {(stop - start) / 60:.1f} min).")
@@ -73,19 +103,85 @@ class NWBImagingSetup:
     V: object  # TODO
 
 
+def frames_per_read(dset: _h5.Dataset) -> int:
+    """the number of frames to be read at once from `dset`.
+    the value is aligned to the chunks of the dataset, if any."""
+    frame_bytes = max(int(_np.prod(dset.shape[1:])) * dset.dtype.itemsize, 1)
+    num_frames = max(READ_BLOCK_BYTES // frame_bytes, 1)
+    if dset.chunks is not None:
+        per_chunk = dset.chunks[0]
+        num_frames = max(num_frames // per_chunk, 1) * per_chunk
+    return min(num_frames, max(dset.shape[0], 1))
+
+
+def is_plain_gzip(dset: _h5.Dataset) -> bool:
+    """whether the chunks of `dset` can be decompressed using zlib alone."""
+    return all((
+        (dset.chunks is not None),
+        (dset.compression == 'gzip'),
+        (not dset.shuffle),
+        (not dset.fletcher32),
+        (dset.scaleoffset is None),
+    ))
+
+
+def native_dtype(dset: _h5.Dataset) -> _np.dtype:
+    """the dtype of `dset` in the native byte order."""
+    return dset.dtype.newbyteorder('=')
+
+
+def read_gzip_frames(dset: _h5.Dataset) -> _npt.NDArray[_np.number]:
+    """reads (T, W, H) frames from the gzip-compressed chunks of `dset`,
+    bypassing the HDF5 filter pipeline so that chunks are decompressed
+    in parallel. returns a C-contiguous array of shape (T, H, W)."""
+    num_frames, width, height = dset.shape
+    out = _np.empty((num_frames, height, width), dtype=native_dtype(dset))
+
+    def _read_chunk(sel: tuple[slice]):
+        mask, raw = dset.id.read_direct_chunk(tuple(s.start for s in sel))
+        if not (mask & 0x1):
+            raw = _zlib.decompress(raw)
+        chunk = _np.frombuffer(raw, dtype=dset.dtype).reshape(dset.chunks)
+        chunk = chunk[tuple(slice(0, s.stop - s.start) for s in sel)]
+        out[sel[0], sel[2], sel[1]] = chunk.transpose((0, 2, 1))
+
+    with _ThreadPoolExecutor(max_workers=DECOMPRESS_WORKERS) as pool:
+        for _ in pool.map(_read_chunk, dset.iter_chunks()):
+            pass
+    return out
+
+
+def read_channel_frames(dset: _h5.Dataset) -> _npt.NDArray[_np.number]:
+    """reads (T, W, H) frames from `dset` block by block,
+    and returns them as a C-contiguous array of shape (T, H, W)."""
+    if is_plain_gzip(dset):
+        return read_gzip_frames(dset)
+    num_frames, width, height = dset.shape
+    out = _np.empty((num_frames, height, width), dtype=native_dtype(dset))
+    block = frames_per_read(dset)
+    buf = _np.empty((block, width, height), dtype=dset.dtype)
+    for offset in range(0, num_frames, block):
+        size = min(block, num_frames - offset)
+        dset.read_direct(buf, _np.s_[offset:(offset + size)], _np.s_[:size])
+        out[offset:(offset + size)] = buf[:size].transpose((0, 2, 1))
+    return out
+
+
 def load_imaging_data(
-    rawfile: PathLike,
+    rawfile: H5FileLike,
     timebases: _timebases.Timebases,
     read_frames: bool = True,
     verbose: bool = True
 ) -> ImagingData:
     if read_frames:
-        with _h5.File(rawfile, 'r') as src:
+        with _open_h5(rawfile) as src:
             start = _now()
-            _logging.info("reading B frames...")
-            im_B = _np.array(src["image/Ib"], dtype=_np.float32).transpose((0, 2, 1))  # (T, H, W)
-            _logging.info("reading V frames...")
-            im_V = _np.array(src["image/Iv"], dtype=_np.float32).transpose((0, 2, 1))
+            _logging.info("reading B and V frames...")
+            with _ThreadPoolExecutor(max_workers=2) as pool:
+                read_B = pool.submit(read_channel_frames, src["image/Ib"])
+                read_V = pool.submit(read_channel_frames, src["image/Iv"])
+                im_B = read_B.result()  # (T, H, W)
+                im_V = read_V.result()
             stop = _now()
             _logging.info(f"done reading imaging data (took {(stop - start) / 60:.1f} min).")
     else:
@@ -150,31 +246,77 @@ def setup_imaging_device(
     )
 
 
+def write_channel_frames(
+    outfile: Path,
+    data: _npt.NDArray,
+    chan: str,
+    compress: bool = True,
+    position: int = 0,
+    verbose: bool = True,
+):
+    """writes (T, H, W) frames of a channel to a TIFF file.
+
+    compressed frames are written in a single call, one strip per frame
+    (tiles would pad the frames to multiples of 16 pixels),
+    so that they form a single series in the file.
+    uncompressed frames are copied into a memory-mapped TIFF file."""
+    _logging.debug("writing %s frames...", chan)
+    start = _now()
+    outfile.parent.mkdir(parents=True, exist_ok=True)
+    if compress:
+        with _TiffWriter(str(outfile), bigtiff=True) as out:
+            out.write(
+                data,
+                rowsperstrip=data.shape[1],
+                photometric='minisblack',
+                **tiff_compression(),
+            )
+    else:
+        out = _tiff_memmap(
+            str(outfile),
+            shape=data.shape,
+            dtype=data.dtype,
+            bigtiff=True,
+            photometric='minisblack',
+        )
+        rng = range(0, data.shape[0], WRITE_BATCH_SIZE)
+        if verbose:
+            rng = _tqdm(rng, desc=f"writing {chan} frames", unit='batch', position=position)
+        for offset in rng:
+            block = _np.s_[offset:(offset + WRITE_BATCH_SIZE)]
+            _np.copyto(out[block], data[block])
+        out.flush()
+        del out
+    stop = _now()
+    _logging.debug("done writing %s frames (took %.1f sec)", chan, stop - start)
+
+
 def write_imaging_data(
     nwbfile: _nwb.NWBFile,
     destination: _configure.DestinationPaths,
     frames: ImagingData,
     setup: NWBImagingSetup,
     write_frames: bool = True,
+    compress: bool = True,
     verbose: bool = True,
 ):
     outfiles = destination.imaging
     if write_frames:
-        for chan in frames.CHANNELS:
-            _logging.debug(f"writing {chan} frames...")
-            start = _now()
-            outfile = Path(getattr(outfiles, chan))
-            if not outfile.parent.exists():
-                outfile.parent.mkdir(parents=True)
-            data = getattr(frames, chan)
-            with _TiffWriter(str(outfile), bigtiff=True) as out:
-                rng = range(data.shape[0])
-                if verbose:
-                    rng = _tqdm(rng, desc=f"writing {chan} frames")
-                for i in rng:
-                    out.write(data[i], contiguous=True)
-            stop = _now()
-            _logging.debug(f"done writing {chan} frames (took {(stop - start):.1f} sec)")
+        # the channels are written to separate files from separate threads
+        with _ThreadPoolExecutor(max_workers=len(frames.CHANNELS)) as pool:
+            futures = [
+                pool.submit(
+                    write_channel_frames,
+                    outfile=Path(getattr(outfiles, chan)),
+                    data=getattr(frames, chan),
+                    chan=chan,
+                    compress=compress,
+                    position=i,
+                    verbose=verbose,
+                ) for i, chan in enumerate(frames.CHANNELS)
+            ]
+            for future in futures:
+                future.result()
     else:
         _logging.info('skip writing imaging frames')
 
@@ -204,4 +346,4 @@ def write_imaging_data(
     nwbfile.add_acquisition(sig_B)
     nwbfile.add_acquisition(sig_V)
     stop = _now()
-    _logging.debug(f"done registering channels to the NWB file (took {(stop - start):.1f} sec).")
+    _logging.debug("done registering channels to the NWB file (took %.1f sec).", stop - start)
@@ -25,9 +25,15 @@ from typing import Optional, Any
 from typing_extensions import Self
 from dataclasses import dataclass
 from datetime import datetime as _datetime
+from concurrent.futures import (
+    Executor as _Executor,
+    Future as _Future,
+    ThreadPoolExecutor as _ThreadPoolExecutor,
+)
 from uuid import uuid4 as _uuid4
 import warnings as _warnings
 
+import h5py as _h5
 import pynwb as _nwb
 from hdmf.build.warnings import (
     DtypeConversionWarning as _DtypeConversionWarning,
@@ -38,12 +44,14 @@ import bdbc_session_explorer as _sessx
 from .types import (
     PathLike,
     PathsLike,
+    H5FileLike,
 )
 from . import (
     logging as _logging,
     configure as _configure,
     file_metadata as _file_metadata,
     timebases as _timebases,
+    dataio as _dataio,
     daq as _daq,
     trials as _trials,
     videos as _videos,
@@ -52,13 +60,20 @@ from . import (
     tracking as _tracking,
 )
 
+RAW_CHUNK_CACHE_BYTES = 64 * 1024 ** 2  # the chunk cache of the shared raw-data handle
+RAW_CHUNK_CACHE_SLOTS = 65521  # a prime number, much larger than the number of cached chunks
+OUTPUT_CHUNK_CACHE_BYTES = 64 * 1024 ** 2  # the chunk cache of the NWB file being written
+OUTPUT_CHUNK_CACHE_SLOTS = 65521
+
 
 @dataclass
 class PackagingEnvironment:
     """the temporary storage of variables during the
     packaging procedure"""
     verbose: bool = True
+    compression: _dataio.Compression = _dataio.DEFAULT_COMPRESSION
     paths: Optional[_configure.PathSettings] = None
+    rawh5: Optional[_h5.File] = None
     metadata: Optional[_file_metadata.Metadata] = None
     trialspec: Optional[_sessx.TrialSpec] = None
     timebases: Optional[_timebases.Timebases] = None
@@ -67,9 +82,18 @@ class PackagingEnvironment:
     nwbfile: Optional[_nwb.NWBFile] = None
     imgsetup: Optional[_imaging.NWBImagingSetup] = None
     imaging: Optional[_imaging.ImagingData] = None
+    pending_imaging: Optional[_Future] = None
+    roimeta: Optional[_file_metadata.ROISetMetadata] = None
     has_behavior_flag: bool = False
     downsampled: Optional[object] = None  # TODO
 
+    @property
+    def rawdata(self) -> H5FileLike:
+        """the raw-data file, being the shared handle if it is open"""
+        if self.rawh5 is not None:
+            return self.rawh5
+        return self.paths.source.rawdata
+
     def loaded_trials(self) -> bool:
         return self.has_trials_flag
 
@@ -107,11 +131,12 @@ class PackagingEnvironment:
         if add_to_nwb:
             for ts in _daq.iterate_raw_daq_recordings(
                 metadata=self.metadata,
-                rawfile=self.paths.source.rawdata,
+                rawfile=self.rawdata,
                 timebases=self.timebases,
+                compression=self.compression,
                 verbose=self.verbose,
             ):
-                _logging.debug(f"add: {ts.name}")
+                _logging.debug("add: %s", ts.name)
                 self.nwbfile.add_acquisition(ts)
         return self
 
@@ -120,11 +145,12 @@ class PackagingEnvironment:
     ) -> Self:
         for ts in _daq.iterate_downsampled_daq_recordings(
             metadata=self.metadata,
-            rawfile=self.paths.source.rawdata,
+            rawfile=self.rawdata,
             timebases=self.timebases,
+            compression=self.compression,
             verbose=self.verbose
         ):
-            _logging.debug(f"add: {ts.name}")
+            _logging.debug("add: %s", ts.name)
             self.downsampled.add(ts)
         return self
 
@@ -139,6 +165,7 @@ class PackagingEnvironment:
     def add_behavior_videos(
         self,
         copy_videos: bool = True,
+        copy_mode: _videos.CopyMode = 'auto',
     ) -> Self:
         if copy_videos:
             if self.has_videos():
@@ -148,6 +175,7 @@ class PackagingEnvironment:
                     timebases=self.timebases,
                     paths=self.paths,
                     copy_files=True,
+                    copy_mode=copy_mode,
                     verbose=self.verbose
                 )
             else:
@@ -168,15 +196,34 @@ class PackagingEnvironment:
             )
         return self
 
+    def prefetch_imaging_data(
+        self,
+        executor: _Executor,
+        to_be_written: bool = True,
+        used_for_rois: bool = True,
+    ) -> Self:
+        """starts loading the imaging data in the background,
+        so that reading the frames overlaps with the other stages"""
+        self.pending_imaging = executor.submit(
+            _imaging.load_imaging_data,
+            rawfile=self.rawdata,
+            timebases=self.timebases,
+            read_frames=(to_be_written or used_for_rois),
+            verbose=self.verbose,
+        )
+        return self
+
     def add_imaging_data(
         self,
         to_be_written: bool = True,
         used_for_rois: bool = True,
+        compress: bool = True,
     ) -> Self:
         return add_imaging_data_impl(
             self,
             to_be_written=to_be_written,
             used_for_rois=used_for_rois,
+            compress=compress,
         )
 
     def add_rois(
@@ -185,14 +232,15 @@ class PackagingEnvironment:
     ) -> Self:
         if register_rois:
             flat = self.imaging.flatten()
-            meta = _file_metadata.read_roi_metadata(
-                self.paths.source.mesoscaler,
-                verbose=self.verbose
-            )
+            if self.roimeta is None:
+                self.roimeta = _file_metadata.read_roi_metadata(
+                    self.paths.source.mesoscaler,
+                    verbose=self.verbose
+                )
             _rois.write_roi_entries(
                 nwbfile=self.nwbfile,
                 metadata=self.metadata,
-                roimeta=meta,
+                roimeta=self.roimeta,
                 flattened_data=flat,
                 setup=self.imgsetup,
                 verbose=self.verbose,
@@ -222,11 +270,20 @@ class PackagingEnvironment:
             _warnings.simplefilter('ignore', category=_DtypeConversionWarning)
             if not outfile.parent.exists():
                 outfile.parent.mkdir(parents=True)
-            with _nwb.NWBHDF5IO(
-                outfile,
-                mode=mode,
-                manager=_nwb.get_manager(),
-            ) as out:
+            with (
+                _h5.File(
+                    outfile,
+                    mode,
+                    rdcc_nbytes=OUTPUT_CHUNK_CACHE_BYTES,
+                    rdcc_nslots=OUTPUT_CHUNK_CACHE_SLOTS,
+                ) as h5out,
+                _nwb.NWBHDF5IO(
+                    outfile,
+                    mode=mode,
+                    manager=_nwb.get_manager(),
+                    file=h5out,
+                ) as out,
+            ):
                 out.write(self.nwbfile)
         _logging.info(
             f"saved NWB file to: '{outfile}'",
@@ -270,12 +327,15 @@ def is_missing(
 def process(
     session: _sessx.Session,
     copy_videos: bool = True,
+    video_copy_mode: _videos.CopyMode = 'auto',
     register_rois: bool = True,
     write_imaging_frames: bool = True,
+    compress_imaging_frames: bool = True,
     add_downsampled: bool = True,
     only_downsampled: bool = False,
     override_metadata: Optional[dict[str, Any]] = None,
     overwrite: bool = False,
+    compression: _dataio.Compression = _dataio.DEFAULT_COMPRESSION,
     verbose: bool = True,
     rawroot: Optional[PathsLike] = None,
     videoroot: Optional[PathLike] = None,
@@ -290,6 +350,8 @@ def process(
     eyemodeldir: Optional[PathLike] = None,
 ) -> Optional[_nwb.NWBFile]:
     """returns an NWB file in case it is newly computed."""
+    # not to reuse the config files located for other sessions
+    _configure.clear_dlc_config_cache()
     paths = _configure.setup_path_settings(
         session=session,
         rawroot=rawroot,
@@ -311,34 +373,57 @@ def process(
     if outfile.exists() and (not overwrite):
         _logging.warning(f"file already exists: '{outfile}'")
         return
-    metadata = _file_metadata.read_recordings_metadata(
-        paths.session,
-        paths.source.rawdata,
-        override=override_metadata,
-    )
+    to_be_written = write_imaging_frames and (not only_downsampled)
+    with (
+        _h5.File(
+            paths.source.rawdata,
+            'r',
+            rdcc_nbytes=RAW_CHUNK_CACHE_BYTES,
+            rdcc_nslots=RAW_CHUNK_CACHE_SLOTS,
+        ) as rawh5,
+        _ThreadPoolExecutor(max_workers=1) as background,
+        _tracking.validation.cached_tables(),
+    ):
+        metadata = _file_metadata.read_recordings_metadata(
+            paths.session,
+            rawh5,
+            override=override_metadata,
+        )
 
-    env = PackagingEnvironment(
-        paths=paths,
-        metadata=metadata,
-        trialspec=session.trialspec,
-        verbose=verbose,
-    )
-    env = env.configure_nwbfile()
-    env = env.load_timebases()
-    env = env.add_raw_recordings(add_to_nwb=(not only_downsampled))
-    env = env.add_trials(add_to_nwb=(not only_downsampled))
-    env = env.add_behavior_videos(copy_videos=copy_videos and (not only_downsampled))
-    env = env.add_imaging_data(
-        to_be_written=write_imaging_frames and (not only_downsampled),
-        used_for_rois=register_rois,
-    )
-    env = env.add_rois(register_rois=register_rois)
-    env = env.add_tracking(add_to_nwb=(not only_downsampled))
-    if add_downsampled:
-        env = env.configure_downsampled_module()
-        env = env.add_downsampled_recordings()
-        env = env.add_downsampled_trials()
-        env = env.add_downsampled_tracking()
+        env = PackagingEnvironment(
+            paths=paths,
+            metadata=metadata,
+            trialspec=session.trialspec,
+            verbose=verbose,
+            compression=compression,
+            rawh5=rawh5,
+        )
+        env = env.configure_nwbfile()
+        env = env.load_timebases()
+        env = env.prefetch_imaging_data(
+            background,
+            to_be_written=to_be_written,
+            used_for_rois=register_rois,
+        )
+        env = env.add_raw_recordings(add_to_nwb=(not only_downsampled))
+        env = env.add_trials(add_to_nwb=(not only_downsampled))
+        env = env.add_behavior_videos(
+            copy_videos=copy_videos and (not only_downsampled),
+            copy_mode=video_copy_mode,
+        )
+        env = env.add_imaging_data(
+            to_be_written=to_be_written,
+            used_for_rois=register_rois,
+            compress=compress_imaging_frames,
+        )
+        env = env.add_rois(register_rois=register_rois)
+        env = env.add_tracking(add_to_nwb=(not only_downsampled))
+        if add_downsampled:
+            env = env.configure_downsampled_module()
+            env = env.add_downsampled_recordings()
+            env = env.add_downsampled_trials()
+            env = env.add_downsampled_tracking()
+        env.rawh5 = None
     env = env.write_nwb_file()
     return env.nwbfile
 
@@ -350,17 +435,11 @@ def load_timebases_impl(
     """loads the timebase/trigger info into this environment"""
     triggers, timebases = _timebases.read_timebases(
         metadata=env.metadata,
-        rawfile=env.paths.source.rawdata,
+        rawfile=env.rawdata,
         verbose=env.verbose
     )
-    triggers, timebases = _timebases.validate_timebase_with_rawdata(
-        rawfile=env.paths.source.rawdata,
-        triggers=triggers,
-        timebases=timebases,
-        verbose=env.verbose
-    )
-    triggers, timebases = _timebases.validate_timebase_with_imaging(
-        rawfile=env.paths.source.rawdata,
+    triggers, timebases = _timebases.validate_timebase_with_recordings(
+        rawfile=env.rawdata,
         triggers=triggers,
         timebases=timebases,
         verbose=env.verbose
@@ -400,7 +479,10 @@ def configure_nwbfile_impl(
         species=metadata.subject.species,
         subject_id=metadata.subject.ID,
         weight=metadata.subject.weight,
-        date_of_birth=_datetime.combine(metadata.subject.date_of_birth, _datetime.min.time()).astimezone(None),
+        date_of_birth=_datetime.combine(
+            metadata.subject.date_of_birth,
+            _datetime.min.time(),
+        ).astimezone(None),  # the local UTC offset on that date
         strain=metadata.subject.strain,
     )
     _logging.info("configured an NWB file")
@@ -423,13 +505,13 @@ def add_trials_impl(
 
     if downsample:
         trials = _trials.load_downsampled_trials(
-            env.paths.source.rawdata,
+            env.rawdata,
             trialspec=env.trialspec,
         )
         parent = env.downsampled
     else:
         trials = _trials.load_trials(
-            env.paths.source.rawdata,
+            env.rawdata,
             trialspec=env.trialspec,
         )
         parent = env.nwbfile
@@ -463,14 +545,18 @@ def add_imaging_data_impl(
     env: PackagingEnvironment,
     to_be_written: bool = True,
     used_for_rois: bool = True,
+    compress: bool = True,
 ) -> PackagingEnvironment:
-    read_frames = (to_be_written or used_for_rois)
-    env.imaging = _imaging.load_imaging_data(
-        rawfile=env.paths.source.rawdata,
-        timebases=env.timebases,
-        read_frames=read_frames,
-        verbose=env.verbose,
-    )
+    if env.pending_imaging is not None:
+        env.imaging = env.pending_imaging.result()
+        env.pending_imaging = None
+    else:
+        env.imaging = _imaging.load_imaging_data(
+            rawfile=env.rawdata,
+            timebases=env.timebases,
+            read_frames=(to_be_written or used_for_rois),
+            verbose=env.verbose,
+        )
     env.imgsetup = _imaging.setup_imaging_device(
         metadata=env.metadata,
         nwbfile=env.nwbfile,
@@ -482,6 +568,7 @@ def add_imaging_data_impl(
         frames=env.imaging,
         setup=env.imgsetup,
         write_frames=to_be_written,
+        compress=compress,
         verbose=env.verbose
     )
     return env
@@ -513,9 +600,10 @@ def add_tracking_impl(
         timebases=env.timebases,
         triggers=env.triggers,
         downsample=downsample,
+        compression=env.compression,
         verbose=env.verbose,
     ):
-        _logging.debug(f"adding: {pose.name}")
+        _logging.debug("adding: %s", pose.name)
         behav.add(pose)
 
     pupil = _tracking.load_pupil_fitting(
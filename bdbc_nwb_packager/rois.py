@@ -32,7 +32,6 @@ from scipy.signal import (
     butter as _butter,
     filtfilt as _filtfilt,
 )
-from sklearn.linear_model import LinearRegression as _LinearRegression
 from tqdm import tqdm as _tqdm
 
 import pynwb as _nwb
@@ -50,6 +49,8 @@ from . import (
     imaging as _imaging,
 )
 
+ROI_MEAN_BLOCK_SIZE = 1024  # the number of frames processed at once to compute ROI means
+
 
 @dataclass
 class ROISegmentation:
@@ -148,7 +149,9 @@ class SignalFilter:
         return cls(b, a)
 
     def __call__(self, x):
-        return _filtfilt(self.b, self.a, x)
+        """filters `x` along the first (i.e. time) axis.
+        a (T, R) array filters all the R signals at once."""
+        return _filtfilt(self.b, self.a, x, axis=0)
 
 
 @dataclass
@@ -159,25 +162,59 @@ class CoefficientEstimation:
 
     @classmethod
     def fit(cls, V, B) -> Self:
-        V = V.reshape((-1, 1))
-        B = B.reshape((-1, 1))
-        mod = _LinearRegression(fit_intercept=True).fit(V, B)
-        res = B - mod.predict(V)
-        return cls(
-            slope=float(mod.coef_.ravel()[0]),
-            intercept=float(mod.intercept_.ravel()[0]),
-            residuals=res.ravel(),
+        """ordinary least-squares fit of B = slope * V + intercept."""
+        return cls.fit_each(V.reshape((-1, 1)), B.reshape((-1, 1)))[0]
+
+    @classmethod
+    def fit_each(cls, V, B) -> tuple[Self]:
+        """fits B = slope * V + intercept for each column of the (T, R) arrays
+        at once, solved in the closed form."""
+        Vm = V.mean(axis=0, dtype=_np.float64)
+        Bm = B.mean(axis=0, dtype=_np.float64)
+        dv = V - Vm
+        db = B - Bm
+        slopes = _np.einsum('tr,tr->r', dv, db) / _np.einsum('tr,tr->r', dv, dv)
+        intercepts = Bm - slopes * Vm
+        residuals = (db - slopes * dv).astype(B.dtype, copy=False)
+        return tuple(
+            cls(
+                slope=float(slopes[i]),
+                intercept=float(intercepts[i]),
+                residuals=residuals[:, i],
+            ) for i in range(slopes.size)
         )
 
 
-def compute_single_roi_signal(
-    roi: _file_metadata.SingleROIMetadata,
-    flattened_data: _imaging.ImagingData,
+def compute_roi_means(
+    frames: _npt.NDArray[_np.number],
+    masks: _npt.NDArray[_np.bool_],
+) -> _npt.NDArray[_np.float32]:
+    """computes the mean values over each of `masks` (R, P) for each of
+    `frames` (T, P), and returns them as a (T, R) array.
+
+    the masks are turned into a single averaging matrix, so that the frames
+    are read only once (block by block), instead of once per ROI."""
+    weights = masks.astype(_np.float32)
+    with _np.errstate(invalid='ignore', divide='ignore'):
+        weights /= weights.sum(1, keepdims=True)  # (R, P)
+    weights = _np.ascontiguousarray(weights.T)  # (P, R)
+    out = _np.empty((frames.shape[0], weights.shape[1]), dtype=_np.float32)
+    for offset in range(0, frames.shape[0], ROI_MEAN_BLOCK_SIZE):
+        block = _np.s_[offset:(offset + ROI_MEAN_BLOCK_SIZE)]
+        _np.matmul(frames[block].astype(_np.float32, copy=False), weights, out=out[block])
+    return out
+
+
+def compute_filtered_dFF(
+    mean_B: _npt.NDArray[_np.float32],
+    mean_V: _npt.NDArray[_np.float32],
     signal_filter: SignalFilter,
-) -> SingleROISignal:
+) -> tuple[_npt.NDArray[_np.floating], _npt.NDArray[_np.floating]]:
+    """converts the (T, R) ROI mean values into the filtered dF/F signals.
+    the frames of V are shifted by a half frame forward to match those of B."""
 
     def _baseline(x):
-        return _np.median(x)
+        return _np.median(x, axis=0)
 
     def _as_dFF(x):
         m = _baseline(x)
@@ -185,19 +222,26 @@ def compute_single_roi_signal(
 
     def _half_frame_forward(V):
         interp = (V[1:] + V[:-1]) / 2
-        return _np.concatenate([(V[0],), interp])
+        return _np.concatenate([V[:1], interp], axis=0)
 
-    mask = roi.mask.ravel()
-    B = _as_dFF(flattened_data.B[:, mask].mean(1))
+    B = _as_dFF(mean_B)
     V = _half_frame_forward(
-        _as_dFF(flattened_data.V[:, mask].mean(1))
+        _as_dFF(mean_V)
     )
-    B = signal_filter(B)
-    V = signal_filter(V)
-    corr = CoefficientEstimation.fit(V, B)
+    return signal_filter(B), signal_filter(V)
+
+
+def compute_single_roi_signal(
+    roi: _file_metadata.SingleROIMetadata,
+    time: _npt.NDArray[_np.floating],
+    B: _npt.NDArray[_np.floating],
+    V: _npt.NDArray[_np.floating],
+    corr: CoefficientEstimation,
+) -> SingleROISignal:
+    """packs the signals of a single ROI, together with its correction."""
     return SingleROISignal(
         metadata=roi,
-        time=flattened_data.time,
+        time=time,
         B=B,
         V=V,
         corrected=corr.residuals,
@@ -219,18 +263,34 @@ def compute_roi_signals(
         bp_range=bp_range,
         sampling_rate=metadata.imaging.planes[1].frame_rate
     )
-    rng = roimeta.rois
-    _logging.debug(f"start pre-processing {len(rng)} ROIs")
+    rois = roimeta.rois
+    _logging.debug("start pre-processing %d ROIs", len(rois))
     start = _now()
+    masks = _np.stack([roi.mask.ravel() for roi in rois], axis=0)
+    B, V = compute_filtered_dFF(
+        compute_roi_means(flattened_data.B, masks),
+        compute_roi_means(flattened_data.V, masks),
+        signal_filter=filt,
+    )
+    corrs = CoefficientEstimation.fit_each(V, B)
+
+    rng = range(len(rois))
     if verbose:
         rng = _tqdm(rng, desc='processing rois')
     processed = []
-    for roi in rng:
-        _logging.debug(f"processing: {roi.name}")
-        proc = compute_single_roi_signal(roi, flattened_data, filt)
+    for i in rng:
+        roi = rois[i]
+        _logging.debug("processing: %s", roi.name)
+        proc = compute_single_roi_signal(
+            roi,
+            time=flattened_data.time,
+            B=B[:, i],
+            V=V[:, i],
+            corr=corrs[i],
+        )
         processed.append(proc)
     stop = _now()
-    _logging.debug(f"done ROI pre-processing (took {(stop - start):.1f} sec)")
+    _logging.debug("done ROI pre-processing (took %.1f sec)", stop - start)
     return tuple(processed)
 
 
@@ -286,9 +346,11 @@ def setup_roisignals_entry(
     _logging.info('registering ROIs...')
     start = _now()
     timebases = roisigs[0].time
+    num_samples = roisigs[0].B.size
     signals = dict()
     for typ in seg.channels.keys():
-        signals[typ] = []
+        # (T, R), filled column by column
+        signals[typ] = _np.empty((num_samples, len(roisigs)), dtype=_np.float32)
 
     with _warnings.catch_warnings():
         # NOTE: just to suppress known (probably harmless) warnings
@@ -299,8 +361,8 @@ def setup_roisignals_entry(
         )
 
         # register rois (and collect signals)
-        for roi in roisigs:
-            _logging.debug(f"registering: {roi.metadata.name}")
+        for i, roi in enumerate(roisigs):
+            _logging.debug("registering: %s", roi.metadata.name)
             for typ, pln in seg.frames.items():
                 pln.add_roi(
                     roi_name=roi.metadata.name,
@@ -308,12 +370,12 @@ def setup_roisignals_entry(
                     image_mask=roi.metadata.mask,
                 )
             for typ in seg.channels.keys():
-                signals[typ].append(getattr(roi, typ).ravel())
+                signals[typ][:, i] = getattr(roi, typ).ravel()
 
         # register FOVs (i.e. B and V channel frames)
         FOVs = dict()
         for frame, pln in seg.frames.items():
-            _logging.debug(f"registering FOV for: {frame} channel")
+            _logging.debug("registering FOV for: %s channel", frame)
             FOVs[frame] = pln.create_roi_table_region(
                 region=[idx for idx in range(len(roisigs))],
                 description=seg.frame_description(frame),
@@ -323,11 +385,11 @@ def setup_roisignals_entry(
         # register signals
         dff = _DfOverF()
         for typ, FOV in FOVs.items():
-            _logging.debug(f"registering ROI signals for type: {typ}")
+            _logging.debug("registering ROI signals for type: %s", typ)
             sigs = _RoiResponseSeries(
                 name=seg.channel_entry(typ),
                 description=seg.channel_description(typ),
-                data=_np.stack(signals[typ], axis=1),
+                data=signals[typ],
                 unit="a.u.",
                 rois=FOV,
                 timestamps=getattr(timebases, typ),
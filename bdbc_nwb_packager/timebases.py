@@ -28,7 +28,8 @@ import numpy.typing as _npt
 import h5py as _h5
 
 from .types import (
-    PathLike,
+    H5FileLike,
+    open_h5 as _open_h5,
 )
 from . import (
     logging as _logging,
@@ -40,7 +41,7 @@ Timebase = _npt.NDArray[_np.float32]
 Indices  = _npt.NDArray[_np.integer]
 
 
-@dataclass
+@dataclass(slots=True)
 class Timebases:
     raw: Timebase
     videos: Timebase
@@ -69,7 +70,7 @@ class Timebases:
         return self.__class__(**fields)
 
 
-@dataclass
+@dataclass(slots=True)
 class PulseTriggers:
     videos: Indices
     B: Indices
@@ -80,17 +81,6 @@ class PulseTriggers:
         """the pulse triggers for hemodynamics-corrected signals"""
         return self.B
 
-    def as_timebases(
-        self,
-        ref: _npt.NDArray[_np.floating]
-    ) -> Timebase:
-        return Timebases(
-            raw=ref,
-            videos=ref[self.videos] if self.videos is not None else None,
-            B=ref[self.B],
-            V=ref[self.V],
-        )
-
     def replace(
         self,
         videos: Optional[Indices] = None,
@@ -107,20 +97,53 @@ class PulseTriggers:
         return self.__class__(**fields)
 
 
+def read_as_vector(
+    dset: _h5.Dataset,
+    dtype: _npt.DTypeLike,
+) -> _npt.NDArray:
+    """reads the content of `dset` directly into a buffer of `dtype`,
+    and returns it as a flattened array."""
+    buf = _np.empty(dset.shape, dtype=dtype)
+    dset.read_direct(buf)
+    if buf.ndim == 1:
+        return buf
+    return buf.ravel()  # a view of the contiguous buffer
+
+
+def dataset_shape(
+    src: _h5.Group,
+    path: str,
+) -> tuple[int]:
+    """reads the shape of the dataset at `path`,
+    without creating an h5py Dataset object."""
+    return _h5.h5d.open(src.id, path.encode('utf-8')).shape
+
+
+def read_as_indices(dset: _h5.Dataset) -> Indices:
+    """reads MATLAB-format (i.e. 1-based) indices in `dset`,
+    and converts them in place into Python-format indices."""
+    idxx = read_as_vector(dset, _np.uint32)
+    idxx -= 1
+    return idxx
+
+
 def read_timebases(
     metadata: _file_metadata.Metadata,
-    rawfile: PathLike,
+    rawfile: H5FileLike,
     verbose: bool = True,
 ) -> tuple[PulseTriggers, Timebases]:
-    with _h5.File(rawfile, 'r') as src:
+    with _open_h5(rawfile) as src:
+        pulses = src['sync_pulse']
+        ticks  = src['tick_in_second']
+
         # NOTE: indexing is in the MATLAB format:
-        # need to subtract 1 to convert to the Python format indices
-        imgB = _np.array(src["sync_pulse/img_acquisition_start_b"], dtype=_np.uint32).ravel() - 1
-        imgV = _np.array(src["sync_pulse/img_acquisition_start_v"], dtype=_np.uint32).ravel() - 1
+        # `read_as_indices` converts them to the Python format indices
+        imgB = read_as_indices(pulses["img_acquisition_start_b"])
+        imgV = read_as_indices(pulses["img_acquisition_start_v"])
 
-        if 'vid_acquisition_start' in src['sync_pulse'].keys():
-            videoPulse = _np.array(src["sync_pulse/vid_acquisition_start"], dtype=_np.uint32).ravel() - 1
-            videoTime  = _np.array(src["tick_in_second/vid"], dtype=_np.float32).ravel()
+        if 'vid_acquisition_start' in pulses:
+            videoPulse = read_as_indices(pulses["vid_acquisition_start"])
+            videoTime  = read_as_vector(ticks["vid"], _np.float32)
         else:
             _logging.warning("found no video pulses")
             videoPulse = None
@@ -132,66 +155,104 @@ def read_timebases(
             V=imgV,
         )
         timebase = Timebases(
-            raw=_np.array(src["tick_in_second/raw"], dtype=_np.float32).ravel(),
+            raw=read_as_vector(ticks["raw"], _np.float32),
             videos=videoTime,
-            B=_np.array(src["tick_in_second/img_b"], dtype=_np.float32).ravel(),
-            V=_np.array(src["tick_in_second/img_v"], dtype=_np.float32).ravel(),
+            B=read_as_vector(ticks["img_b"], _np.float32),
+            V=read_as_vector(ticks["img_v"], _np.float32),
         )
         return trigs, timebase
 
 
 def validate_timebase_with_rawdata(
-    rawfile: PathLike,
+    rawfile: H5FileLike,
+    triggers: PulseTriggers,
+    timebases: Timebases,
+    verbose: bool = True,
+) -> tuple[PulseTriggers, Timebases]:
+    with _open_h5(rawfile) as src:
+        num_columns, num_samples = dataset_shape(src, 'behavior_raw/data')
+    return trim_to_num_samples(num_samples, triggers, timebases)
+
+
+def validate_timebase_with_imaging(
+    rawfile: H5FileLike,
     triggers: PulseTriggers,
     timebases: Timebases,
     verbose: bool = True,
 ) -> tuple[PulseTriggers, Timebases]:
-    with _h5.File(rawfile, 'r') as src:
-        num_columns, num_samples = src['behavior_raw/data'].shape
+    num_frames = dict()
+    with _open_h5(rawfile) as src:
+        num_frames['B'] = dataset_shape(src, 'image/Ib')[0]
+        num_frames['V'] = dataset_shape(src, 'image/Iv')[0]
+    return trim_to_num_frames(num_frames, triggers, timebases)
+
+
+def validate_timebase_with_recordings(
+    rawfile: H5FileLike,
+    triggers: PulseTriggers,
+    timebases: Timebases,
+    verbose: bool = True,
+) -> tuple[PulseTriggers, Timebases]:
+    """runs the checks of `validate_timebase_with_rawdata()` and
+    `validate_timebase_with_imaging()` with a single access to `rawfile`."""
+    num_frames = dict()
+    with _open_h5(rawfile) as src:
+        num_columns, num_samples = dataset_shape(src, 'behavior_raw/data')
+        num_frames['B'] = dataset_shape(src, 'image/Ib')[0]
+        num_frames['V'] = dataset_shape(src, 'image/Iv')[0]
+    triggers, timebases = trim_to_num_samples(num_samples, triggers, timebases)
+    return trim_to_num_frames(num_frames, triggers, timebases)
+
+
+def trim_to_num_samples(
+    num_samples: int,
+    triggers: PulseTriggers,
+    timebases: Timebases,
+) -> tuple[PulseTriggers, Timebases]:
     num_timepoints = timebases.raw.size
     if num_timepoints < num_samples:
         raise ValueError(f"the number of timepoints ({num_timepoints}) is smaller than the number of samples ({num_samples})")
     elif num_timepoints > num_samples:
-        _logging.debug(f"trimming raw ticks: {num_timepoints} --> {num_samples}")
+        _logging.debug("trimming raw ticks: %d --> %d", num_timepoints, num_samples)
         timebases = timebases.replace(raw=timebases.raw[:num_samples])
     else:
         pass
     return (triggers, timebases)
 
 
-def validate_timebase_with_imaging(
-    rawfile: PathLike,
+def trim_to_num_frames(
+    num_frames: dict[str, int],
     triggers: PulseTriggers,
     timebases: Timebases,
-    verbose: bool = True,
 ) -> tuple[PulseTriggers, Timebases]:
-    num_frames = dict()
-    with _h5.File(rawfile, 'r') as src:
-        num_frames['B'] = src['image/Ib'].shape[0]
-        num_frames['V'] = src['image/Iv'].shape[0]
-
-    for chan in num_frames.keys():
+    trimmed_pulses = dict()
+    trimmed_ticks = dict()
+    for chan, num in num_frames.items():
         pulses = getattr(triggers, chan)
         timebase = getattr(timebases, chan)
 
         num_pulses = pulses.size
-        if num_pulses < num_frames[chan]:
-            raise ValueError(f"the number of frames ({num_frames[chan]}) is larger than the number of pulses ({num_pulses})")
-        elif num_pulses > num_frames[chan]:
-            _logging.debug(f"trimming {chan} pulses: {num_pulses} --> {num_frames[chan]}")
-            triggers = triggers.replace(**{chan: pulses[:num_frames[chan]]})
+        if num_pulses < num:
+            raise ValueError(f"the number of frames ({num}) is larger than the number of pulses ({num_pulses})")
+        elif num_pulses > num:
+            _logging.debug("trimming %s pulses: %d --> %d", chan, num_pulses, num)
+            trimmed_pulses[chan] = pulses[:num]
         else:
             pass
 
         num_ticks = timebase.size
-        if num_ticks < num_frames[chan]:
-            raise ValueError(f"the number of frames ({num_frames[chan]}) is larger  than the number of ticks ({num_ticks})")
-        elif num_ticks > num_frames[chan]:
-            _logging.debug(f"trimming {chan} ticks: {num_ticks} --> {num_frames[chan]}")
-            timebases = timebases.replace(**{chan: timebase[:num_frames[chan]]})
+        if num_ticks < num:
+            raise ValueError(f"the number of frames ({num}) is larger  than the number of ticks ({num_ticks})")
+        elif num_ticks > num:
+            _logging.debug("trimming %s ticks: %d --> %d", chan, num_ticks, num)
+            trimmed_ticks[chan] = timebase[:num]
         else:
             pass
 
+    if len(trimmed_pulses) > 0:
+        triggers = triggers.replace(**trimmed_pulses)
+    if len(trimmed_ticks) > 0:
+        timebases = timebases.replace(**trimmed_ticks)
     return (triggers, timebases)
 
 
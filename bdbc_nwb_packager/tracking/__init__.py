@@ -19,20 +19,13 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-from importlib import reload as _reload  # DEBUG
-
-from . import (
+from . import (  # noqa: F401
     alignment,
     validation,
     dlc,
     pupil,
 )
 
-_reload(alignment)  # DEBUG
-_reload(validation)  # DEBUG
-_reload(dlc)  # DEBUG
-_reload(pupil)  # DEBUG
-
 upsample = alignment.upsample
 downsample = alignment.downsample
 iterate_pose_estimations = dlc.iterate_pose_estimations
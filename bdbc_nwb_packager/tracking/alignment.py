@@ -33,40 +33,74 @@ def upsample(
     pulseidxx: _npt.NDArray[_np.integer],
     max_skips: int = 1,
 ) -> _npt.NDArray[_np.float32]:
+    """linearly interpolates `values` (given at `pulseidxx`) onto `size` samples.
+
+    each pair of consecutive non-NaN values is interpolated, provided that
+    at most `max_skips` NaN values lie in between. samples not covered by
+    any such pair are left NaN."""
     out = _np.empty((size,), dtype=_np.float32)
     out.fill(_np.nan)
-    offsetceil = pulseidxx.size - 1  # exclude the last one
-    offset = 0
+    num_pulses = pulseidxx.size
+    validx = _np.flatnonzero(~_np.isnan(values[:num_pulses]))
+    if validx.size < 2:
+        return out
 
-    def _linear(start, stop, vstart, vend):
-        siz = stop - start
-        vals = _np.arange(0, siz) / (siz - 1)  # [0, 1]
-        return vals * (vend - vstart) + vstart
+    # pairs of consecutive valid values that are close enough
+    accepted = _np.diff(validx) <= (max_skips + 1)
+    if not _np.any(accepted):
+        return out
+    pulses = _np.asarray(pulseidxx, dtype=_np.int64)
+    starts = _np.clip(pulses[validx[:-1][accepted]], 0, size)
+    stops  = _np.clip(pulses[validx[1:][accepted]] + 1, 0, size)
 
-    offsetceil = pulseidxx.size - 1  # exclude the last one
-    offset = 0
-    while offset < offsetceil:
-        if _np.isnan(values[offset]):
-            offset += 1
-            continue
-        elif ~_np.isnan(values[offset + 1]):
-            start = pulseidxx[offset]
-            stop  = pulseidxx[offset + 1] + 1
-            out[start:stop] = _linear(start, stop, values[offset], values[offset + 1])
-            offset += 1
-        else:
-            for skip in range(1, max_skips + 1):
-                if ((offset + skip) < offsetceil) and ~_np.isnan(values[offset + skip + 1]):
-                    start = pulseidxx[offset]
-                    stop  = pulseidxx[offset + skip + 1] + 1
-                    out[start:stop] = _linear(
-                        start, stop,
-                        values[offset], values[offset + skip + 1]
-                    )
-                    offset += skip  # further incremented below
-                    break
-            # finally (not interpolated other than the block above)
-            offset += 1
+    # samples covered by any of the accepted pairs
+    coverage = _np.zeros((size + 1,), dtype=_np.int32)
+    _np.add.at(coverage, starts, 1)
+    _np.add.at(coverage, stops, -1)
+    covered = _np.flatnonzero(_np.cumsum(coverage[:-1]) > 0)
+    out[covered] = _np.interp(covered, pulses[validx], values[validx])
+    return out
+
+
+def bucket_bounds(
+    pulseidxx: _npt.NDArray[_np.integer],
+    size: int,
+) -> _npt.NDArray[_np.int64]:
+    """the (N + 1) boundaries of the N buckets starting at `pulseidxx`.
+    the last bucket spans the mean interval between the pulses,
+    clipped at `size`."""
+    interval = round(_np.diff(pulseidxx).mean())
+    bounds = _np.empty((pulseidxx.size + 1,), dtype=_np.int64)
+    bounds[:-1] = pulseidxx
+    bounds[-1] = min(size, pulseidxx[-1] + interval)
+    return _np.clip(bounds, 0, size)
+
+
+def bucket_nanmean(
+    values: _npt.NDArray[_np.floating],
+    bounds: _npt.NDArray[_np.integer],
+) -> _npt.NDArray[_np.float32]:
+    """computes NaN-aware means of `values[bounds[i]:bounds[i+1]]`
+    along the first axis, for each of the (non-decreasing) `bounds`.
+    empty or all-NaN buckets result in NaN.
+
+    the sums are reduced per bucket, so that no temporary arrays larger
+    than `values` itself are allocated."""
+    out = _np.empty((bounds.size - 1,) + values.shape[1:], dtype=_np.float32)
+    out.fill(_np.nan)
+    nonempty = bounds[1:] > bounds[:-1]
+    if not _np.any(nonempty):
+        return out
+    # the non-empty buckets are contiguous; values after the last one are dropped
+    values = values[:bounds[-1]]
+    starts = bounds[:-1][nonempty]
+    valid = ~_np.isnan(values)
+    total = _np.add.reduceat(_np.where(valid, values, 0), starts, axis=0, dtype=_np.float64)
+    count = _np.add.reduceat(valid, starts, axis=0, dtype=_np.int64)
+    means = _np.empty(total.shape, dtype=_np.float32)
+    means.fill(_np.nan)
+    _np.divide(total, count, out=means, where=(count > 0))
+    out[nonempty] = means
     return out
 
 
@@ -75,9 +109,11 @@ def downsample(
     pulseidxx: _npt.NDArray[_np.integer],
     reduce: Callable[[_npt.NDArray[_np.floating]], float] = _np.nanmean,
 ) -> _npt.NDArray[_np.float32]:
+    if reduce is _np.nanmean:
+        return bucket_nanmean(values, bucket_bounds(pulseidxx, values.shape[0]))
+    interval = round(_np.diff(pulseidxx).mean())
     out = _np.empty((pulseidxx.size,), dtype=_np.float32)
     out.fill(_np.nan)
-    interval = round(_np.diff(pulseidxx).mean())
     with _warnings.catch_warnings():
         _warnings.filterwarnings(
             'ignore',
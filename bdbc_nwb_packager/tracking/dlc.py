@@ -20,11 +20,15 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import Optional
+from typing import Optional, Iterator
+from dataclasses import dataclass
 from time import time as _now
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
 import warnings as _warnings
 
 import numpy as _np
+import numpy.typing as _npt
+import pandas as _pd
 from ndx_pose import (
     PoseEstimationSeries as _PoseEstimationSeries,
     PoseEstimation as _PoseEstimation,
@@ -35,6 +39,11 @@ from .. import (
     configure as _configure,
     timebases as _timebases,
 )
+from ..dataio import (
+    Compression,
+    DEFAULT_COMPRESSION,
+    compressed as _compressed,
+)
 from . import (
     validation as _validation,
     alignment as _alignment,
@@ -45,6 +54,33 @@ NAME_MAPPINGS = {
     'face': 'face',
     'eye': 'eye',
 }
+COORDS = ('x', 'y', 'likelihood')
+
+
+@dataclass
+class KeypointEstimations:
+    """the DeepLabCut results of a single view, as plain arrays.
+    no NWB objects are involved, so that it can be prepared from any thread."""
+    view: str
+    scorer: str
+    keypoints: tuple[str]
+    timestamps: _npt.NDArray[_np.floating]
+    positions: _npt.NDArray[_np.float32]  # (T, num_keypoints, 2)
+    confidence: _npt.NDArray[_np.float32]  # (T_video, num_keypoints)
+    dimensions: tuple[int]  # (width, height) of the video
+    original_video: str
+
+
+def as_keypoint_array(
+    dlctab: _pd.DataFrame,
+    keypoints: tuple[str],
+) -> _npt.NDArray[_np.float32]:
+    """returns the DeepLabCut results as a single float32 array
+    of shape (T, len(keypoints), len(COORDS))."""
+    scorer = dlctab.columns[0][0]
+    columns = [(scorer, kpt, coord) for kpt in keypoints for coord in COORDS]
+    values = dlctab.loc[:, columns].to_numpy(dtype=_np.float32)
+    return values.reshape((dlctab.shape[0], len(keypoints), len(COORDS)))
 
 
 def iterate_pose_estimations(
@@ -54,11 +90,125 @@ def iterate_pose_estimations(
     mismatch_tolerance: int = _validation.MISMATCH_TOLERANCE_DEFAULT,
     downsample: bool = False,
     downsample_pcutoff: float = 0.2,
+    compression: Compression = DEFAULT_COMPRESSION,
     verbose: bool = True,
-) -> _PoseEstimation:
+) -> Iterator[_PoseEstimation]:
     """load DeepLabCut results from corresponding HDF5 files,
-    and returns a generator iterating over PoseEstimation objects."""
+    and returns a generator iterating over PoseEstimation objects.
+
+    The arrays of the views are prepared concurrently, but the
+    PoseEstimation objects are created from the calling thread,
+    in the order of `NAME_MAPPINGS`."""
+    with _ThreadPoolExecutor(max_workers=len(NAME_MAPPINGS)) as pool:
+        futures = [
+            pool.submit(
+                prepare_keypoint_estimations,
+                view=view,
+                paths=paths,
+                timebases=timebases,
+                triggers=triggers,
+                mismatch_tolerance=mismatch_tolerance,
+                downsample=downsample,
+                downsample_pcutoff=downsample_pcutoff,
+                verbose=verbose,
+            ) for view in NAME_MAPPINGS.keys()
+        ]
+        for future in futures:
+            estimations = future.result()
+            if estimations is not None:
+                yield setup_pose_estimation(estimations, compression=compression)
+
+
+def prepare_keypoint_estimations(
+    view: str,
+    paths: _configure.PathSettings,
+    timebases: _timebases.Timebases,
+    triggers: Optional[_timebases.PulseTriggers] = None,
+    mismatch_tolerance: int = _validation.MISMATCH_TOLERANCE_DEFAULT,
+    downsample: bool = False,
+    downsample_pcutoff: float = 0.2,
+    verbose: bool = True,
+) -> Optional[KeypointEstimations]:
+    """prepares the keypoint arrays for a single view.
+    returns None in case the video or the DeepLabCut results are missing."""
+    destvideos = paths.destination.videos.relative_to(paths.destination.session_dir)
+    srcvideo = getattr(paths.source.videos, view)
+    if srcvideo.path is None:
+        _logging.warning(
+            f"missing the {view} video",
+        )
+        return None
+    dlcpath = getattr(paths.source.deeplabcut, view)
+    if dlcpath is None:
+        _logging.warning(
+            f"missing the {view} model results",
+        )
+        return None
+    elif downsample:
+        _logging.info(
+            f'preparing downsampled estimations from the {view} video...',
+        )
+    else:
+        _logging.info(
+            f'preparing estimations from the {view} video...',
+        )
+    start = _now()
 
+    t, trigs, dlctab = _validation.prepare_table_results(
+        view=view,
+        tabpath=dlcpath,
+        srcvideo=srcvideo,
+        t_video=timebases.videos,
+        triggers=triggers.videos,
+        mismatch_tolerance=mismatch_tolerance,
+    )
+
+    keypoints = tuple(dlctab.columns.get_level_values(1).unique())
+    values = as_keypoint_array(dlctab, keypoints)
+
+    if downsample:
+        # FIXME: this block may be removed
+        # when the DeepLabCut model become more efficient
+        t = timebases.dFF
+        # one raw-rate column is upsampled at a time, to keep the memory use low
+        bounds = _alignment.bucket_bounds(triggers.dFF, timebases.raw.size)
+        positions = _np.empty((triggers.dFF.size, len(keypoints), 2), dtype=_np.float32)
+        for i, kpt in enumerate(keypoints):
+            est = _validation.validate_keypoint(
+                dlctab, kpt,
+                threshold=downsample_pcutoff,
+            )
+            for j, ax in enumerate(est.AXES):
+                upsampled = _alignment.upsample(
+                    getattr(est, ax),
+                    size=timebases.raw.size,
+                    pulseidxx=trigs,
+                )
+                positions[:, i, j] = _alignment.bucket_nanmean(upsampled, bounds)
+    else:
+        positions = values[:, :, :2]
+
+    stop = _now()
+    _logging.info(f'done preparation of the {view} video (took {(stop - start):.1f} s).')
+    return KeypointEstimations(
+        view=view,
+        scorer=dlctab.columns[0][0],
+        keypoints=keypoints,
+        timestamps=t,
+        positions=positions,
+        confidence=values[:, :, 2],
+        dimensions=(srcvideo.width, srcvideo.height),
+        original_video=str(getattr(destvideos, view)),
+    )
+
+
+def setup_pose_estimation(
+    estimations: KeypointEstimations,
+    compression: Compression = DEFAULT_COMPRESSION,
+) -> _PoseEstimation:
+    """creates the PoseEstimation object of a single view.
+    must be called from the thread that builds the NWB file."""
+    view = estimations.view
     # NOTE:
     # The use of PoseEstimation and PoseEstimationSeries seems to elicit
     # PendingDeprecationWarning (that cannot be controlled from our side).
@@ -66,99 +216,32 @@ def iterate_pose_estimations(
     with _warnings.catch_warnings():
         _warnings.filterwarnings('ignore', category=PendingDeprecationWarning)
 
-        destvideos = paths.destination.videos.relative_to(paths.destination.session_dir)
-        for view, model in NAME_MAPPINGS.items():
-            srcvideo = getattr(paths.source.videos, view)
-            if srcvideo.path is None:
-                _logging.warning(
-                    f"missing the {view} video",
-                )
-                continue
-            dlcpath = getattr(paths.source.deeplabcut, view)
-            if dlcpath is None:
-                _logging.warning(
-                    f"missing the {view} model results",
-                )
-                continue
-            elif downsample:
-                _logging.info(
-                    f'preparing downsampled estimations from the {view} video...',
-                )
-            else:
-                _logging.info(
-                    f'preparing estimations from the {view} video...',
-                )
-            start = _now()
-
-            t, trigs, dlctab = _validation.prepare_table_results(
-                view=view,
-                tabpath=dlcpath,
-                srcvideo=srcvideo,
-                t_video=timebases.videos,
-                triggers=triggers.videos,
-                mismatch_tolerance=mismatch_tolerance,
-            )
+        series = []
+        # TODO: think over about what names may be appropriate
+        node_names = [f"{kpt}" for kpt in estimations.keypoints]
+        for i, (kpt, node_name) in enumerate(zip(estimations.keypoints, node_names)):
+            series.append(_PoseEstimationSeries(
+                name=node_name,
+                description=f"Keypoint '{kpt}' from the {view} video.",
+                data=_compressed(estimations.positions[:, i, :], compression=compression),
+                unit='pixels',
+                reference_frame="(0,0) corresponds to the top left corner of the video.",
+                timestamps=estimations.timestamps,
+                confidence=_compressed(estimations.confidence[:, i], compression=compression),
+                confidence_definition="Softmax output of the deep neural network.",
+            ))
 
-            if downsample:
-                t = timebases.dFF
-
-                def _downsample(x):
-                    u = _alignment.upsample(
-                        x,
-                        size=timebases.raw.size,
-                        pulseidxx=trigs,
-                    )
-                    return _alignment.downsample(
-                        u,
-                        pulseidxx=triggers.dFF,
-                        reduce=_np.nanmean,
-                    )
-
-            scorer = dlctab.columns[0][0]
-            pose_estimation_name = f"{view}_video_keypoints"
-            keypoints = tuple(set(col[1] for col in dlctab.columns))
-
-            series = []
-            # TODO: think over about what names may be appropriate
-            node_names = [f"{kpt}" for kpt in keypoints]
-            for kpt, node_name in zip(keypoints, node_names):
-                if downsample:
-                    # FIXME: this block may be removed
-                    # when the DeepLabCut model become more efficient
-                    data = _validation.validate_keypoint(
-                        dlctab, kpt,
-                        threshold=downsample_pcutoff,
-                    ).apply(_downsample).stack()
-                else:
-                    data = _np.stack([
-                        dlctab[scorer, kpt, 'x'].values,
-                        dlctab[scorer, kpt, 'y'].values
-                    ], axis=1)
-
-                series.append(_PoseEstimationSeries(
-                    name=node_name,
-                    description=f"Keypoint '{kpt}' from the {view} video.",
-                    data=data,
-                    unit='pixels',
-                    reference_frame="(0,0) corresponds to the top left corner of the video.",
-                    timestamps=t,
-                    confidence=_np.array(dlctab[scorer, kpt, 'likelihood'].values),
-                    confidence_definition="Softmax output of the deep neural network.",
-                ))
-
-            stop = _now()
-            _logging.info(f'done preparation (took {(stop - start):.1f} s).')
-            yield _PoseEstimation(
-                name=pose_estimation_name,
-                description=f"Estimated positions of keypoints from the {view} view frames using DeepLabCut.",
-                pose_estimation_series=series,
-                nodes=node_names,
-                original_videos=[str(getattr(destvideos, view))],
-                labeled_videos=[],
-                dimensions=_np.array(
-                    [[srcvideo.width, srcvideo.height]], dtype=_np.uint16,
-                ),  # pixel dimensions of the video
-                scorer=scorer,
-                source_software="DeepLabCut",
-                source_software_version="2.3.10",
-            )
+        return _PoseEstimation(
+            name=f"{view}_video_keypoints",
+            description=f"Estimated positions of keypoints from the {view} view frames using DeepLabCut.",
+            pose_estimation_series=series,
+            nodes=node_names,
+            original_videos=[estimations.original_video],
+            labeled_videos=[],
+            dimensions=_np.array(
+                [estimations.dimensions], dtype=_np.uint16,
+            ),  # pixel dimensions of the video
+            scorer=estimations.scorer,
+            source_software="DeepLabCut",
+            source_software_version="2.3.10",
+        )
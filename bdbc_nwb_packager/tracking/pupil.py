@@ -20,7 +20,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import Tuple, Generator, Union, Optional
+from typing import Tuple, Union, Optional
 from collections import namedtuple as _namedtuple
 from time import time as _now
 
@@ -57,9 +57,10 @@ class PupilFittingData(_namedtuple('PupilFittingData', (
     'eye',  # EyeTracking
     'pupil_dia',  # PupilTracking
 ))):
-    def items(self) -> Generator[Tuple[str, Tracking], None, None]:
-        for fld, val in zip(self._fields, self):
-            yield fld, val
+    __slots__ = ()
+
+    def items(self) -> Tuple[Tuple[str, Tracking], ...]:
+        return tuple(zip(self._fields, self))
 
 
 def empty_data(
@@ -20,10 +20,13 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import Callable, ClassVar
+from typing import Callable, ClassVar, Optional, Iterator
 from typing_extensions import Self
 from pathlib import Path
 from dataclasses import dataclass
+from functools import lru_cache as _lru_cache
+from contextlib import contextmanager
+from threading import Lock as _Lock
 
 import numpy as _np
 import numpy.typing as _npt
@@ -34,6 +37,10 @@ from .. import logging as _logging
 VALIDATION_ALPHA = _np.nan  # must be smaller (e.g. 0.5)
 VALIDATION_THRESHOLD = 0.2  # must be higher (e.g. 0.9999)
 MISMATCH_TOLERANCE_DEFAULT = 0  # FIXME: ideally it must be zero
+NUM_CACHED_TABLES = 4  # body, face, eye and pupil
+
+# PyTables (used by `read_hdf`) is not thread-safe
+TABLE_READ_LOCK = _Lock()
 
 
 @dataclass
@@ -102,7 +109,7 @@ def validate_index_ranges(
     """a temporary solution until sizes of timebases/videos are more nicely handled."""
     delta = num_frames - num_pulses
     if delta > 0:
-        _logging.debug(f"{view}: frame-pulse difference={delta}")
+        _logging.debug("%s: frame-pulse difference=%d", view, delta)
     if delta == 0:
         pulserange = slice(None, None)
         framerange = slice(None, None)
@@ -117,6 +124,57 @@ def validate_index_ranges(
     return pulserange, framerange
 
 
+@_lru_cache(maxsize=NUM_CACHED_TABLES)
+def _read_table_cached(
+    tabpath: Path,
+    mtime_ns: int,
+    size: int,
+    entry_path: str,
+    start: Optional[int],
+    stop: Optional[int],
+) -> _pd.DataFrame:
+    with TABLE_READ_LOCK:
+        return _pd.read_hdf(tabpath, key=entry_path, start=start, stop=stop)
+
+
+def read_table(
+    tabpath: Path,
+    entry_path: str = 'df_with_missing',
+    start: Optional[int] = None,
+    stop: Optional[int] = None,
+) -> _pd.DataFrame:
+    """reads the rows `start:stop` of the table once, so that the results
+    can be reused for both the original and the downsampled data.
+    the modification time and the size of the file are part of the cache key,
+    so that a regenerated file is read again.
+    Note that the returned DataFrame is shared, and must not be modified."""
+    tabpath = Path(tabpath)
+    stat = tabpath.stat()
+    return _read_table_cached(
+        tabpath,
+        stat.st_mtime_ns,
+        stat.st_size,
+        entry_path,
+        start,
+        stop,
+    )
+
+
+def clear_table_cache():
+    """releases the tables cached by `read_table`."""
+    _read_table_cached.cache_clear()
+
+
+@contextmanager
+def cached_tables() -> Iterator[None]:
+    """limits the use of the `read_table` cache to the enclosed block,
+    so that the tables are not kept in memory after a session."""
+    try:
+        yield
+    finally:
+        clear_table_cache()
+
+
 def prepare_table_results(
     view: str,
     tabpath: Path,
@@ -132,8 +190,12 @@ def prepare_table_results(
         num_pulses=t_video.size,
         mismatch_tolerance=mismatch_tolerance,
     )
-    tab = _pd.read_hdf(tabpath, key=entry_path)
-    tab = tab.iloc[vclip]
+    tab = read_table(
+        tabpath,
+        entry_path=entry_path,
+        start=vclip.start,
+        stop=vclip.stop,
+    )
     t = t_video[tclip]
     trigs = triggers[tclip]
     assert tab.shape[0] == t.size
@@ -20,16 +20,11 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from importlib import reload as _reload  # DEBUG
-
 from . import (
     spec,
     io,
 )
 
-_reload(spec)  # DEBUG
-_reload(io)  # DEBUG
-
 ColumnSpec = spec.ColumnSpec
 TrialSpec = spec.TrialSpec
 Trials = spec.Trials
@@ -25,9 +25,13 @@ import numpy as _np
 import pandas as _pd
 import h5py as _h5
 import pynwb as _nwb
+from hdmf.common import VectorData as _VectorData
 
 import bdbc_session_explorer as _sessx
-from ..types import PathLike
+from ..types import (
+    H5FileLike,
+    open_h5 as _open_h5,
+)
 from .. import (
     logging as _logging,
 )
@@ -40,11 +44,14 @@ def trials_from_group(
     group: _h5.Group,
     trialspec: _sessx.TrialSpec
 ) -> Optional[_spec.Trials]:
-    data   = _np.array(group["data"], dtype=_np.float32).T
-    labels = _np.array(group["label"]).ravel()
-    labels = [lab.decode('utf-8') for lab in labels]  # convert to utf-8
-    _logging.debug(f"trial table shape: {data.shape}")
-    _logging.debug(f"trial columns: {labels}")
+    dset   = group["data"]
+    data   = _np.empty(dset.shape, dtype=_np.float32)
+    dset.read_direct(data)
+    data   = data.T  # (trials, columns)
+    labels = _np.array(group["label"]).ravel().astype(_np.bytes_)
+    labels = _np.char.decode(labels, 'utf-8').tolist()  # convert to utf-8
+    _logging.debug("trial table shape: %s", data.shape)
+    _logging.debug("trial columns: %s", labels)
 
     # validation
     # there can be sessions without any trials (i.e. resting-state)
@@ -52,25 +59,25 @@ def trials_from_group(
         return None
 
     # convert to dataframe
-    table = _pd.DataFrame(data, columns=labels)
+    table = _pd.DataFrame(data, columns=labels, copy=False)
     trialspec = _spec.TrialSpec.from_dict(trialspec)
     return _spec.Trials(table=table, metadata=trialspec)
 
 
 def load_trials(
-    rawfile: PathLike,
+    rawfile: H5FileLike,
     trialspec: _sessx.TrialSpec
 ) -> Optional[_spec.Trials]:
-    with _h5.File(rawfile, 'r') as src:
+    with _open_h5(rawfile) as src:
         # Loading from hdf5 file
         return trials_from_group(src['behavior_raw/trial_info'], trialspec=trialspec)
 
 
 def load_downsampled_trials(
-    rawfile: PathLike,
+    rawfile: H5FileLike,
     trialspec: _sessx.TrialSpec
 ) -> _pd.DataFrame:
-    with _h5.File(rawfile, 'r') as src:
+    with _open_h5(rawfile) as src:
         # Loading from hdf5 file
         return trials_from_group(src['behavior_ds/trial_info'], trialspec=trialspec)
 
@@ -81,33 +88,30 @@ def write_trials(
     verbose: bool = True,
 ):
     is_root = isinstance(parent, _nwb.NWBFile)
-    desc = f"trials of the '{trials.metadata.name}' session"
+    table_desc = f"trials of the '{trials.metadata.name}' session"
     if not is_root:
-        desc = "downsampled " + desc
+        table_desc = "downsampled " + table_desc
+
+    # the whole columns are passed at once, instead of adding rows one by one
+    specs = tuple(trials.metadata.required_columns) + tuple(trials.metadata.task_specific_columns)
+    columns = []
+    for column in specs:
+        _logging.debug("writing column: %s", column.name)
+        desc = column.format_description()
+        _logging.debug("column description: %s", desc)
+        columns.append(_VectorData(
+            name=column.name,
+            description=desc,
+            data=column.get_values_from(trials.table),
+        ))
     trials_table = _nwb.epoch.TimeIntervals(
         name='trials',
-        description=desc
+        description=table_desc,
+        id=list(range(trials.shape[0])),
+        columns=columns,
     )
 
     if is_root:
-        def _finalize(tab):
-            parent.trials = tab
+        parent.trials = trials_table
     else:
-        def _finalize(tab):
-            parent.add(tab)
-
-    for column in trials.metadata.required_columns:
-        # a dirty hack to override descriptions
-        _logging.debug(f"writing column: {column.name}")
-        desc = column.format_description()
-        _logging.debug(f"column description: {desc}")
-        trials_table[column.name].fields['description'] = desc
-    for column in trials.metadata.task_specific_columns:
-        _logging.debug(f"writing column: {column.name}")
-        desc = column.format_description()
-        _logging.debug(f"column description: {desc}")
-        trials_table.add_column(name=column.name, description=desc)
-
-    for trial in trials.iter_trials_as_dict():
-        trials_table.add_row(**trial)
-    _finalize(trials_table)
+        parent.add(trials_table)
@@ -23,6 +23,7 @@ from typing import Union, Iterable, Iterator, ClassVar, Optional
 from typing_extensions import Self
 from dataclasses import dataclass
 
+import numpy as _np
 import pandas as _pd
 
 
@@ -116,12 +117,31 @@ class ColumnSpec:
             description=self.description
         )
 
-    def get_value_from(self, row: dict[str, FieldType]) -> FieldType:
-        value = self.data_type(row[self.input_name])
+    def convert_value(self, value: object) -> FieldType:
+        value = self.data_type(value)
         if self.values is not None:
             value = self.values.value_to_name(value)
         return value
 
+    def get_value_from(self, row: dict[str, FieldType]) -> FieldType:
+        """converts the value of this column in a single `row`.
+        kept as public API, on top of `get_values_from`."""
+        return self.get_values_from(_pd.DataFrame([row]))[0]
+
+    def get_values_from(self, table: _pd.DataFrame) -> list[FieldType]:
+        """returns the converted values of this column for all the rows of `table`.
+        numeric columns are cast as a whole, instead of value by value."""
+        values = table[self.input_name].to_numpy()
+        if self.data_type is str:
+            # converted from Python scalars, e.g. `str(1.5)` instead of `str(np.float32(1.5))`
+            return [self.convert_value(value) for value in values.tolist()]
+        if (self.data_type is int) and (not _np.all(_np.isfinite(values))):
+            raise ValueError(f"cannot convert non-finite values to int: {repr(self.input_name)}")
+        values = values.astype(self.data_type)
+        if self.values is not None:
+            return [self.values.value_to_name(value) for value in values]
+        return values.tolist()
+
     def format_description(self) -> str:
         if self.values is None:
             return self.description
@@ -188,9 +208,11 @@ class TrialSpec:
         self,
         trials: _pd.DataFrame
     ) -> Iterator[dict[str, FieldType]]:
-        for _, row in trials.iterrows():
-            row = row.to_dict()
-            yield dict((col.name, col.get_value_from(row)) for col in self.columns)
+        """iterates over the trials as dictionaries.
+        kept as public API, on top of `ColumnSpec.get_values_from`."""
+        columns = tuple((col.name, col.get_values_from(trials)) for col in self.columns)
+        for i in range(trials.shape[0]):
+            yield dict((name, values[i]) for name, values in columns)
 
     def to_dict(self) -> dict[str, Union[str, Iterable[dict[str, str]]]]:
         return {
@@ -215,4 +237,5 @@ class Trials:
         return self.table.shape
 
     def iter_trials_as_dict(self) -> Iterator[dict[str, FieldType]]:
+        """kept as public API; `write_trials` uses whole columns instead."""
         yield from self.metadata.iter_trials_from(self.table)
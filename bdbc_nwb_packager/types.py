@@ -21,11 +21,15 @@
 # SOFTWARE.
 """the common, too-often-used types and functions."""
 
-from typing import Optional, Union, Iterable
+from typing import Optional, Union, Iterable, Iterator
 from pathlib import Path
+from contextlib import contextmanager
+
+import h5py as _h5
 
 PathLike = Union[str, Path]
 PathsLike = Union[PathLike, Iterable[PathLike]]
+H5FileLike = Union[PathLike, _h5.File]
 
 
 def maybe_path(path: Optional[PathLike]) -> Optional[Path]:
@@ -33,3 +37,14 @@ def maybe_path(path: Optional[PathLike]) -> Optional[Path]:
         return None
     else:
         return Path(path)
+
+
+@contextmanager
+def open_h5(file: H5FileLike, mode: str = 'r') -> Iterator[_h5.File]:
+    """opens `file` in case it is a path.
+    An already-opened file is used as it is, and is left open afterwards."""
+    if isinstance(file, _h5.File):
+        yield file
+    else:
+        with _h5.File(file, mode) as src:
+            yield src
@@ -19,9 +19,12 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-from typing import Optional
+from typing import Optional, Literal
+from pathlib import Path
 from dataclasses import dataclass
 from time import time as _now
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+import os as _os
 import shutil as _shutil
 
 from pynwb import NWBFile as _NWBFile
@@ -42,19 +45,134 @@ VIEWS = {
 }
 
 
-@dataclass
+CopyMode = Literal['auto', 'copy', 'hardlink', 'symlink']
+COPY_BLOCK_BYTES = 16 * 1024 ** 2  # the size of a request to `os.copy_file_range`
+
+
+@dataclass(slots=True)
 class VideoEntries:
     body: Optional[_ImageSeries]
     face: Optional[_ImageSeries]
     eye: Optional[_ImageSeries]
 
 
+def copy_file_contents(srcpath: Path, dstpath: Path):
+    """copies the content of the file using `os.copy_file_range` in blocks,
+    so that the kernel (or the file server) may copy it without
+    the data passing through the user space.
+    falls back to `shutil.copyfile` where it is not available."""
+    if not hasattr(_os, 'copy_file_range'):
+        _shutil.copyfile(srcpath, dstpath)
+        return
+    with open(srcpath, 'rb') as src, open(dstpath, 'wb') as dst:
+        total = _os.fstat(src.fileno()).st_size
+        offset = 0
+        try:
+            while offset < total:
+                copied = _os.copy_file_range(
+                    src.fileno(),
+                    dst.fileno(),
+                    min(COPY_BLOCK_BYTES, total - offset),
+                    offset,
+                    offset,
+                )
+                if copied == 0:
+                    # e.g. the range is not supported by the file system
+                    break
+                offset += copied
+        except OSError:
+            # e.g. not supported between these file systems
+            pass
+        if offset < total:
+            # copy the rest through the user space
+            src.seek(offset)
+            dst.seek(offset)
+            _shutil.copyfileobj(src, dst, COPY_BLOCK_BYTES)
+            offset = dst.tell()
+        if offset != total:
+            raise OSError(f"incomplete copy of '{srcpath}': {offset} out of {total} bytes")
+
+
+def copy_video_file(srcpath: Path, dstpath: Path, mode: CopyMode = 'auto'):
+    """places the video file at `dstpath`.
+
+    - 'copy' copies the content using `copy_file_contents`, without copying
+      the permission bits.
+    - 'hardlink' creates a hard link (no data is copied).
+    - 'symlink' creates a symbolic link to the resolved source path.
+    - 'auto' creates a hard link in case the source and the destination
+      reside on the same file system, and copies the file otherwise."""
+    srcpath = Path(srcpath)
+    dstpath = Path(dstpath)
+    if mode not in ('auto', 'copy', 'hardlink', 'symlink'):
+        raise ValueError(f"unknown copy mode: {repr(mode)}")
+
+    def _entry(path: Path) -> Path:
+        # the directory entry of `path`, with its parent directories resolved
+        return path.parent.resolve() / path.name
+
+    if dstpath.exists() and srcpath.samefile(dstpath):
+        # the destination already refers to the source, e.g. through
+        # a symlinked directory, or as a link made in a previous run
+        if _entry(dstpath) in (_entry(srcpath), srcpath.resolve()):
+            # unlinking it would remove the source itself
+            return
+        elif mode != 'copy':
+            return
+        # otherwise the link is replaced with a real copy
+    if dstpath.exists() or dstpath.is_symlink():
+        dstpath.unlink()
+
+    if mode == 'auto':
+        if srcpath.stat().st_dev == dstpath.parent.stat().st_dev:
+            mode = 'hardlink'
+        else:
+            mode = 'copy'
+    if mode == 'copy':
+        copy_file_contents(srcpath, dstpath)
+        return
+    elif mode == 'symlink':
+        dstpath.symlink_to(srcpath.resolve())
+        return
+    try:
+        _os.link(srcpath, dstpath)
+    except OSError:
+        # e.g. the file system does not support hard links
+        copy_file_contents(srcpath, dstpath)
+
+
+def copy_video_files(
+    targets: dict[str, tuple[Path, Path]],
+    mode: CopyMode = 'auto',
+):
+    """copies the video files of the views concurrently.
+    `targets` maps each view to its (source, destination) paths."""
+    def _copy(view: str):
+        srcpath, dstpath = targets[view]
+        _logging.info(f"copying {view} video...")
+        start = _now()
+        copy_video_file(srcpath, dstpath, mode=mode)
+        stop = _now()
+        size = Path(srcpath).stat().st_size / (1024 ** 2)
+        rate = size / max(stop - start, 1e-6)
+        _logging.info(
+            f"done copying {view} video ({size:.0f} MiB, took {(stop - start):.1f} sec, {rate:.0f} MiB/s).",
+        )
+
+    if len(targets) == 0:
+        return
+    with _ThreadPoolExecutor(max_workers=len(targets)) as pool:
+        for _ in pool.map(_copy, targets.keys()):
+            pass
+
+
 def write_videos(
     nwbfile: _NWBFile,
     metadata: _file_metadata.Metadata,
     timebases: _timebases.Timebases,
     paths: _configure.PathSettings,
     copy_files: bool = True,
+    copy_mode: CopyMode = 'auto',
     verbose: bool = True,
 ) -> VideoEntries:
     relfiles = paths.destination.videos.relative_to(
@@ -67,24 +185,26 @@ def write_videos(
         manufacturer=metadata.videos.manufacturer,
     )
 
-    entries = dict()
+    targets = dict()
     for view in VIEWS.keys():
         srcpath = getattr(paths.source.videos, view).path
         dstpath = getattr(paths.destination.videos, view)  # note no need of 'path'
         if srcpath is None:
             _logging.warning(f"skipping {view} video: video file does not exist")
-            entries[view] = None
             continue
         if not dstpath.parent.exists():
             dstpath.parent.mkdir(parents=True)
+        targets[view] = (srcpath, dstpath)
 
-        if copy_files:
-            _logging.info(f"copying {view} video...")
-            start = _now()
-            _shutil.copy(srcpath, dstpath)
-            stop = _now()
-            _logging.info(f"done copying video (took {(stop - start):.1f} sec).")
+    if copy_files:
+        copy_video_files(targets, mode=copy_mode)
 
+    # NWB objects are registered from this thread only
+    entries = dict()
+    for view in VIEWS.keys():
+        if view not in targets.keys():
+            entries[view] = None
+            continue
         desc = VIEWS[view]
         entry = _ImageSeries(
             name=f"{view}_video",
@@ -96,7 +216,7 @@ def write_videos(
             timestamps=t,
             device=device,
         )
-        _logging.debug(f"registering the {view} video to the NWB file")
+        _logging.debug("registering the %s video to the NWB file", view)
         nwbfile.add_acquisition(entry)
         entries[view] = entry
 
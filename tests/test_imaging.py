@@ -0,0 +1,60 @@
+# MIT License
+#
+# Copyright (c) 2024-2025 Keisuke Sehara, Ryo Aoki, and Shoya Sugimoto
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import numpy as np
+import h5py
+import pytest
+
+from bdbc_nwb_packager import imaging
+
+
+def make_rawfile(path, compression=None):
+    rng = np.random.default_rng(0)
+    # stored as (T, W, H), as in the raw HDF5 files
+    frames = dict(
+        (name, rng.integers(0, 4096, size=(10, 7, 5), dtype=np.uint16))
+        for name in ('Ib', 'Iv')
+    )
+    with h5py.File(path, 'w') as out:
+        for name, data in frames.items():
+            out.create_dataset(
+                f"image/{name}",
+                data=data,
+                chunks=((4, 7, 5) if compression is not None else None),
+                compression=compression,
+            )
+    return frames
+
+
+@pytest.mark.parametrize('compression', [None, 'gzip'])
+def test_load_imaging_data_reads_frames(tmp_path, compression):
+    rawfile = tmp_path / 'raw.h5'
+    frames = make_rawfile(rawfile, compression=compression)
+    timebases = object()
+
+    data = imaging.load_imaging_data(rawfile, timebases, read_frames=True, verbose=False)
+
+    assert data.time is timebases
+    for chan, name in (('B', 'Ib'), ('V', 'Iv')):
+        loaded = getattr(data, chan)
+        assert loaded.flags.c_contiguous
+        np.testing.assert_array_equal(loaded, frames[name].transpose((0, 2, 1)))
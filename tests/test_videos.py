@@ -0,0 +1,73 @@
+# MIT License
+#
+# Copyright (c) 2024-2025 Keisuke Sehara, Ryo Aoki, and Shoya Sugimoto
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+from bdbc_nwb_packager import videos
+
+
+@pytest.mark.parametrize('mode', ['auto', 'copy', 'hardlink', 'symlink'])
+def test_copy_video_file_through_symlinked_directory(tmp_path, mode):
+    srcdir = tmp_path / 'source'
+    srcdir.mkdir()
+    srcpath = srcdir / 'body.mp4'
+    content = b'video-content' * 100
+    srcpath.write_bytes(content)
+    linkdir = tmp_path / 'output'
+    linkdir.symlink_to(srcdir, target_is_directory=True)
+
+    videos.copy_video_file(srcpath, linkdir / 'body.mp4', mode=mode)
+
+    assert srcpath.is_file()
+    assert srcpath.read_bytes() == content
+
+
+@pytest.mark.parametrize('previous', ['hardlink', 'symlink'])
+def test_copy_mode_replaces_links_from_previous_runs(tmp_path, previous):
+    srcpath = tmp_path / 'eye.mp4'
+    content = b'eye-video' * 100
+    srcpath.write_bytes(content)
+    dstdir = tmp_path / 'output'
+    dstdir.mkdir()
+    dstpath = dstdir / 'eye.mp4'
+
+    videos.copy_video_file(srcpath, dstpath, mode=previous)
+    assert dstpath.samefile(srcpath)
+    videos.copy_video_file(srcpath, dstpath, mode='copy')
+
+    assert not dstpath.is_symlink()
+    assert not dstpath.samefile(srcpath)
+    assert dstpath.read_bytes() == content
+    assert srcpath.read_bytes() == content
+
+
+def test_copy_file_contents_completes_after_short_copy(tmp_path, monkeypatch):
+    srcpath = tmp_path / 'face.mp4'
+    content = bytes(range(256)) * 1000
+    srcpath.write_bytes(content)
+    dstpath = tmp_path / 'copied.mp4'
+
+    # `copy_file_range` copying nothing must not leave a truncated file
+    monkeypatch.setattr(videos._os, 'copy_file_range', lambda *args: 0, raising=False)
+    videos.copy_file_contents(srcpath, dstpath)
+
+    assert dstpath.read_bytes() == content